@@ -0,0 +1,34 @@
+import os
+import time
+import importlib
+
+# Reference point of the startup report, taken before anything imports pygame
+startup_time:float = time.perf_counter()
+# Must be set before the first pygame import, which happens in whatever engine module is loaded first
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Submodules and public names are only imported on first access (PEP 562), so tools that
+# need one part of the engine don't pay for the rest. engine.core still brings in everything it uses
+_submodules = {
+    "animation", "atlas", "audio", "batch", "bench", "cache", "camera", "collision", "core", "ecs", "enums",
+    "io", "loading", "loop", "math", "particles", "profiler", "render", "replay", "text", "tilemap", "utils", "watcher",
+}
+_names = {
+    "Game": "core", "GS": "core", "Settings": "core", "ResourceManager": "core", "Texture": "core", "SpriteSheet": "core",
+    "SpriteBatch": "render", "TileMap": "tilemap", "Camera": "camera", "GameLoop": "loop", "SpatialHash": "collision",
+    "Animation": "animation", "AnimationPlayer": "animation", "Profiler": "profiler",
+    "Mixer": "audio", "World": "ecs", "ParticleSystem": "particles", "Emitter": "particles",
+    "Benchmark": "bench", "BatchRunner": "batch", "run_batch": "batch",
+}
+
+def __getattr__(name:str):
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _names:
+        value = getattr(importlib.import_module(f".{_names[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _submodules | set(_names))
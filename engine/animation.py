@@ -0,0 +1,105 @@
+from .enums import *
+
+# Shared, immutable description of an animation: which frames, for how long, looping or not
+class Animation:
+    def __init__(self, frames:list['Texture'], fps:float=12, loop:bool=True, indices:list[int]=None, name:str=None) -> None:
+        """
+        frames is usually SpriteSheet.frames, indices picks and orders a subset of them
+        """
+        self._frames:tuple['Texture', ...] = tuple(frames[i] for i in indices) if indices is not None else tuple(frames)
+        if not self._frames: raise ValueError("An animation needs at least one frame")
+        self._frame_duration:float = 1/fps
+        self._loop:bool = loop
+        self._name:str = name if name else "Animation"
+
+    @property
+    def name(self) -> str: return self._name
+
+    @property
+    def frames(self) -> tuple['Texture', ...]: return self._frames
+
+    @property
+    def frame_duration(self) -> float: return self._frame_duration
+
+    @property
+    def duration(self) -> float: return self._frame_duration*len(self._frames)
+
+    @property
+    def loop(self) -> bool: return self._loop
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+# Per-actor playback state, advancing it only touches a few numbers
+class AnimationPlayer:
+    __slots__ = ("_animation", "_time", "_index", "_speed", "_playing", "_finished")
+
+    def __init__(self, animation:Animation=None, speed:float=1.0) -> None:
+        self._animation:Animation = animation
+        self._time:float = 0.0
+        self._index:int = 0
+        self._speed:float = speed
+        self._playing:bool = animation is not None
+        self._finished:bool = False
+
+    @property
+    def animation(self) -> Animation: return self._animation
+
+    @property
+    def index(self) -> int: return self._index
+
+    @property
+    def texture(self) -> 'Texture':
+        return self._animation._frames[self._index] if self._animation else None
+
+    @property
+    def finished(self) -> bool: return self._finished
+
+    @property
+    def playing(self) -> bool: return self._playing
+
+    @property
+    def speed(self) -> float: return self._speed
+    @speed.setter
+    def speed(self, value:float): self._speed = value
+
+    def play(self, animation:Animation, restart:bool=False) -> 'AnimationPlayer':
+        """
+        Switch animation, keeps the current position when it is already playing unless restart
+        """
+        if animation is not self._animation or restart:
+            self._animation = animation
+            self._time = 0.0
+            self._index = 0
+            self._finished = False
+        self._playing = True
+        return self
+
+    def pause(self) -> 'AnimationPlayer':
+        self._playing = False
+        return self
+
+    def resume(self) -> 'AnimationPlayer':
+        self._playing = self._animation is not None
+        return self
+
+    def update(self, dt:float) -> 'Texture':
+        """
+        Advance by dt seconds and return the frame to draw
+        """
+        animation = self._animation
+        if animation is None: return None
+        if self._playing and not self._finished:
+            self._time += dt*self._speed
+            count = len(animation._frames)
+            # Epsilon absorbs float drift from summing many small deltas
+            index = int(self._time/animation._frame_duration+1e-6)
+            if index>=count:
+                if animation._loop:
+                    self._time %= animation._frame_duration*count
+                    index = int(self._time/animation._frame_duration+1e-6)%count
+                else:
+                    index = count-1
+                    self._finished = True
+            self._index = index
+        return animation._frames[self._index]
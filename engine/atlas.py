@@ -0,0 +1,113 @@
+from .enums import *
+
+# Shelf packer for a single atlas page, shelves are filled left to right and stacked top to bottom
+class AtlasPage:
+    def __init__(self, width:int, height:int, padding:int=1) -> None:
+        self._width:int = width
+        self._height:int = height
+        self._padding:int = padding
+        self._shelves:list[list[int]] = [] # [y, height, next free x]
+        self._used_height:int = 0
+        self._rects:list[tuple[object, pygame.Rect]] = []
+        self._surface:pygame.Surface = None
+
+    @property
+    def used_height(self) -> int: return self._used_height
+
+    @property
+    def surface(self) -> pygame.Surface: return self._surface
+
+    def insert(self, key:object, width:int, height:int) -> pygame.Rect:
+        """
+        Reserve a width x height region, returns None when the page is full
+        """
+        w, h = width+self._padding, height+self._padding
+        best:list[int] = None
+        for shelf in self._shelves:
+            # Tightest shelf that fits, keeps tall shelves for tall images
+            if shelf[1]>=h and shelf[2]+w<=self._width and (best is None or shelf[1]<best[1]):
+                best = shelf
+        if best is None:
+            if self._used_height+h>self._height or w>self._width: return None
+            best = [self._used_height, h, 0]
+            self._shelves.append(best)
+            self._used_height += h
+        rect = pygame.Rect(best[2], best[0], width, height)
+        best[2] += w
+        self._rects.append((key, rect))
+        return rect
+
+    def allocate(self) -> 'AtlasPage':
+        """
+        Allocate the full page up front, for pages filled one image at a time with add
+        """
+        self._surface = self._new_surface(self._height)
+        return self
+
+    def add(self, key:object, surface:pygame.Surface) -> pygame.Surface:
+        """
+        Insert an image into an allocated page and copy it in, returns its subsurface or None when the page is full
+        """
+        rect = self.insert(key, surface.get_width(), surface.get_height())
+        if rect is None: return None
+        self._surface.blit(surface, rect, None, pygame.BLEND_RGBA_MAX)
+        return self._surface.subsurface(rect)
+
+    def build(self, surfaces:dict[object, pygame.Surface]) -> dict[object, pygame.Surface]:
+        """
+        Allocate the page surface, copy every image into it and return zero-copy subsurfaces
+        """
+        self._surface = self._new_surface(max(1, self._used_height))
+        self._surface.blits([(surfaces[key], rect, None, pygame.BLEND_RGBA_MAX) for key, rect in self._rects], doreturn=False)
+        return {key: self._surface.subsurface(rect) for key, rect in self._rects}
+
+    def _new_surface(self, height:int) -> pygame.Surface:
+        surface = pygame.Surface((self._width, height), pygame.SRCALPHA)
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha()
+        # Max blending onto a transparent page copies pixels exactly, alpha included
+        surface.fill((0, 0, 0, 0))
+        return surface
+
+# Packs many small images into a few large pages
+class AtlasBuilder:
+    def __init__(self, page_size:int=1024, padding:int=1, max_image_size:int=256) -> None:
+        self._page_size:int = page_size
+        self._padding:int = padding
+        self._max_image_size:int = max_image_size
+        self._surfaces:dict[object, pygame.Surface] = {}
+
+    def add(self, key:object, surface:pygame.Surface) -> 'AtlasBuilder':
+        self._surfaces[key] = surface
+        return self
+
+    def build(self) -> tuple[dict[object, pygame.Surface], list[AtlasPage]]:
+        """
+        Returns the packed surface of every key and the pages.
+        Images too large for the atlas are returned untouched
+        """
+        result:dict[object, pygame.Surface] = {}
+        pages:list[AtlasPage] = []
+        packable:list[object] = []
+        for key, surface in self._surfaces.items():
+            w, h = surface.get_size()
+            # Pages reserve padding after every image, an image plus its padding must fit a page
+            if w>self._max_image_size or h>self._max_image_size or w+self._padding>self._page_size or h+self._padding>self._page_size:
+                result[key] = surface
+            else:
+                packable.append(key)
+        # Decreasing height keeps shelves tight
+        packable.sort(key=lambda key: (self._surfaces[key].get_height(), self._surfaces[key].get_width()), reverse=True)
+        for key in packable:
+            w, h = self._surfaces[key].get_size()
+            for page in pages:
+                if page.insert(key, w, h): break
+            else:
+                page = AtlasPage(self._page_size, self._page_size, self._padding)
+                if not page.insert(key, w, h):
+                    result[key] = self._surfaces[key]
+                    continue
+                pages.append(page)
+        for page in pages:
+            result.update(page.build(self._surfaces))
+        return result, pages
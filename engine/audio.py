@@ -0,0 +1,146 @@
+import time
+from .enums import *
+
+# One playing sound on a mixer channel
+class _Voice:
+    __slots__ = ("sound", "priority", "start", "volume")
+
+    def __init__(self, sound:'Sound', priority:int, start:float, volume:float) -> None:
+        self.sound:'Sound' = sound
+        self.priority:int = priority
+        self.start:float = start
+        self.volume:float = volume
+
+# Plays sounds over a fixed pool of channels. When every channel is busy the oldest voice of the lowest
+# priority is stolen, and a sound never plays on more than its max_voices channels at once
+class Mixer:
+    def __init__(self, channels:int=32) -> None:
+        pygame.mixer.set_num_channels(channels)
+        self._channels:list[pygame.mixer.Channel] = [pygame.mixer.Channel(i) for i in range(channels)]
+        self._voices:list[_Voice] = [None]*channels
+        # When each sound was last started, for min_interval
+        self._last_played:dict['Sound', float] = {}
+        self._music:'Music' = None
+        self._music_loops:int = -1
+        self._volume:float = 1.0
+
+    @property
+    def channel_count(self) -> int: return len(self._channels)
+
+    @property
+    def volume(self) -> float: return self._volume
+    @volume.setter
+    def volume(self, value:float):
+        self._volume = value
+        for channel, voice in zip(self._channels, self._voices):
+            if voice: channel.set_volume(voice.sound.volume*voice.volume*value)
+
+    @property
+    def music(self) -> 'Music': return self._music
+
+    @property
+    def active_voices(self) -> int:
+        return sum(1 for i in range(len(self._channels)) if self._busy(i))
+
+    def voices_of(self, sound:'Sound') -> int:
+        return sum(1 for i, voice in enumerate(self._voices) if voice and voice.sound is sound and self._busy(i))
+
+    def play(self, sound:'Sound', priority:int=None, volume:float=1.0, loops:int=0, fade_ms:int=0) -> pygame.mixer.Channel:
+        """
+        Start sound on a free or stolen channel, priority defaults to the sound's.
+        Returns the channel, or None when the sound was dropped
+        """
+        if sound is None or sound._sound is None: return None
+        now = time.perf_counter()
+        if sound.min_interval and now-self._last_played.get(sound, -sound.min_interval)<sound.min_interval: return None
+        priority = sound.priority if priority is None else priority
+        index = self._pick_channel(sound, priority)
+        if index is None: return None
+        channel = self._channels[index]
+        channel.stop()
+        channel.set_volume(sound.volume*volume*self._volume)
+        channel.play(sound._sound, loops, fade_ms=fade_ms)
+        self._voices[index] = _Voice(sound, priority, now, volume)
+        self._last_played[sound] = now
+        return channel
+
+    def stop(self, sound:'Sound'=None, fade_ms:int=0) -> 'Mixer':
+        """
+        Stop every voice of sound, or everything
+        """
+        for i, voice in enumerate(self._voices):
+            if voice is None or (sound is not None and voice.sound is not sound): continue
+            if fade_ms: self._channels[i].fadeout(fade_ms)
+            else: self._channels[i].stop()
+            self._voices[i] = None
+        return self
+
+    def pause(self) -> 'Mixer':
+        pygame.mixer.pause()
+        pygame.mixer.music.pause()
+        return self
+
+    def resume(self) -> 'Mixer':
+        pygame.mixer.unpause()
+        pygame.mixer.music.unpause()
+        return self
+
+    def play_music(self, music:'Music', loops:int=-1, fade_ms:int=0, start:float=0.0) -> 'Mixer':
+        """
+        Stream music from disk, only a small decode buffer is kept in memory. Replaces the current track
+        """
+        if music is not self._music:
+            pygame.mixer.music.load(music.path)
+            self._music = music
+        pygame.mixer.music.set_volume(music.volume)
+        pygame.mixer.music.play(loops, start, fade_ms)
+        self._music_loops = loops
+        return self
+
+    def reload_music(self, music:'Music') -> 'Mixer':
+        """
+        Reopen a track whose file changed. It restarts if it was playing, otherwise the next play_music picks up the new file
+        """
+        if music is not self._music: return self
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.load(music.path)
+            pygame.mixer.music.play(self._music_loops)
+        else:
+            self._music = None
+        return self
+
+    def stop_music(self, fade_ms:int=0) -> 'Mixer':
+        if fade_ms: pygame.mixer.music.fadeout(fade_ms)
+        else: pygame.mixer.music.stop()
+        return self
+
+    def forget(self, sound:'Sound'):
+        """
+        Drop the mixer's references to an unloaded sound
+        """
+        self.stop(sound)
+        self._last_played.pop(sound, None)
+
+    def _busy(self, index:int) -> bool:
+        if self._voices[index] is None: return False
+        if self._channels[index].get_busy(): return True
+        self._voices[index] = None
+        return False
+
+    def _pick_channel(self, sound:'Sound', priority:int) -> int:
+        free:int = None
+        same:list[int] = []
+        victim:int = None
+        for i, voice in enumerate(self._voices):
+            if not self._busy(i):
+                if free is None: free = i
+                continue
+            if voice.sound is sound: same.append(i)
+            # Lowest priority first, then oldest
+            if victim is None or (voice.priority, voice.start)<(self._voices[victim].priority, self._voices[victim].start): victim = i
+        if sound.max_voices and len(same)>=sound.max_voices:
+            # At the cap, restart the oldest voice of the same sound instead of taking another channel
+            return min(same, key=lambda i: self._voices[i].start)
+        if free is not None: return free
+        if victim is not None and self._voices[victim].priority<=priority: return victim
+        return None
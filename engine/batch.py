@@ -0,0 +1,151 @@
+# =================================================
+# ==================== imports ====================
+# =================================================
+import sys
+import time
+import random
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+from .core import *
+
+# =================================================
+# =============== Batch simulation ================
+# =================================================
+# A session sets up a headless game, runs it (game.run, or its own begin/draw/end loop) and returns its metrics.
+# It is sent to worker processes, so it must be a module level function
+Session = Callable[[Game, int], dict]
+
+class RunResult:
+    def __init__(self, index:int, seed:int, metrics:dict=None, frames:int=0, wall_time:float=0.0, error:str=None) -> None:
+        self.index:int = index
+        self.seed:int = seed
+        self.metrics:dict = metrics if metrics else {}
+        self.frames:int = frames
+        self.wall_time:float = wall_time
+        self.error:str = error
+
+    @property
+    def ok(self) -> bool: return self.error is None
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "seed": self.seed,
+            "frames": self.frames,
+            "wall_time": self.wall_time,
+            "error": self.error,
+            "metrics": self.metrics,
+        }
+
+class BatchResult:
+    def __init__(self, runs:list[RunResult], wall_time:float, workers:int) -> None:
+        self._runs:list[RunResult] = sorted(runs, key=lambda run: run.index)
+        self._wall_time:float = wall_time
+        self._workers:int = workers
+
+    @property
+    def runs(self) -> list[RunResult]: return self._runs
+
+    @property
+    def failed(self) -> list[RunResult]: return [run for run in self._runs if not run.ok]
+
+    @property
+    def wall_time(self) -> float: return self._wall_time
+
+    @property
+    def runs_per_second(self) -> float:
+        return len(self._runs)/self._wall_time if self._wall_time else 0.0
+
+    @property
+    def frames_per_second(self) -> float:
+        return sum(run.frames for run in self._runs)/self._wall_time if self._wall_time else 0.0
+
+    def values(self, metric:str) -> list:
+        """
+        A metric across the successful runs that reported it, in run order
+        """
+        return [run.metrics[metric] for run in self._runs if run.ok and metric in run.metrics]
+
+    def mean(self, metric:str) -> float:
+        values = self.values(metric)
+        return sum(values)/len(values) if values else 0.0
+
+    def __str__(self) -> str:
+        return f"{len(self._runs)} runs ({len(self.failed)} failed) on {self._workers} workers in {self._wall_time:.2f}s, {self.runs_per_second:.1f} runs/s, {self.frames_per_second:.0f} frames/s"
+
+def _run_session(session:Session, index:int, seed:int, game_args:dict) -> RunResult:
+    # Runs inside a worker process, each session gets a fresh game which is closed afterwards so the next one can be current
+    start = time.perf_counter()
+    game:Game = None
+    try:
+        random.seed(seed)
+        game = Game(**game_args)
+        # Initialised apart from construction, so a failing init still reaches close and stops being the current game
+        game.init()
+        metrics = session(game, seed)
+        return RunResult(index, seed, metrics, game.frame_count, time.perf_counter()-start)
+    except Exception:
+        return RunResult(index, seed, frames=game.frame_count if game else 0, wall_time=time.perf_counter()-start, error=traceback.format_exc())
+    finally:
+        if game: game.close()
+
+# Spreads headless sessions over a process pool, a process hosts one game at a time
+class BatchRunner:
+    def __init__(self, session:Session, workers:int=None, game_args:dict=None) -> None:
+        self._session:Session = session
+        self._workers:int = workers
+        self._game_args:dict = {"name": "Batch", "headless": True, "target_fps": 0}
+        if game_args: self._game_args.update(game_args)
+        # Nobody looks at the screen, presenting at the canvas size keeps the scale pass nearly free
+        self._game_args.setdefault("display_size", self._game_args.get("game_definition", vec2(128, 64)))
+        if not self._game_args["headless"]: raise ValueError("Batch sessions must be headless")
+
+    def run(self, count:int, seeds:list[int]=None, progress:Callable[[int, int, RunResult], None]=None) -> BatchResult:
+        """
+        Run count sessions, session i is seeded with seeds[i] (i by default). progress(done, count, run) is called as runs finish
+        """
+        seeds = list(seeds) if seeds is not None else list(range(count))
+        if len(seeds)<count: raise ValueError("Not enough seeds for the batch")
+        start = time.perf_counter()
+        runs:list[RunResult] = []
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            workers = executor._max_workers
+            # Small chunks amortize the inter-process round trip without starving workers at the end
+            chunksize = max(1, count//(workers*4))
+            args = ([self._session]*count, range(count), seeds[:count], [self._game_args]*count)
+            for run in executor.map(_run_session, *args, chunksize=chunksize):
+                runs.append(run)
+                if progress: progress(len(runs), count, run)
+        result = BatchResult(runs, time.perf_counter()-start, workers)
+        for run in result.failed:
+            log("Batch run {} (seed {}) failed\n{}", logLevel.error, run.index, run.seed, run.error)
+        return result
+
+def run_batch(session:Session, count:int, workers:int=None, seeds:list[int]=None, **game_args) -> BatchResult:
+    return BatchRunner(session, workers, game_args).run(count, seeds)
+
+# =================================================
+# ==================== Example ====================
+# =================================================
+def _random_walk(game:Game, seed:int) -> dict:
+    # Bot playtest stand-in: a point wandering until it leaves the canvas or time runs out
+    position = vec2(game.canvas.get_width()/2, game.canvas.get_height()/2)
+    steps = 0
+    def update(dt:float):
+        nonlocal steps
+        steps += 1
+        position.x += Math.randin(-1, 1)
+        position.y += Math.randin(-1, 1)
+        if steps>=2000 or not game.canvas.get_rect().collidepoint(position.x, position.y): game.quit()
+    # Fixed frame time: the simulation runs as fast as the core allows and stays reproducible from the seed
+    GameLoop(game, update, tick_rate=60).run(frame_time=1/60)
+    return {"steps": steps, "escaped": steps<2000}
+
+if __name__ == "__main__":
+    # Usage: python -m engine.batch [runs] [workers]
+    count = int(sys.argv[1]) if len(sys.argv)>1 else 32
+    workers = int(sys.argv[2]) if len(sys.argv)>2 else None
+    result = run_batch(_random_walk, count, workers)
+    log(str(result), logLevel.timer)
+    log("mean steps {:.0f}, escaped {}/{}", logLevel.timer, result.mean("steps"), sum(result.values("escaped")), len(result.runs))
@@ -0,0 +1,167 @@
+# =================================================
+# ==================== imports ====================
+# =================================================
+import sys
+import time
+import math
+from typing import Callable
+from .core import *
+
+# =================================================
+# ================== Benchmarking =================
+# =================================================
+# Phases timed by the benchmark runner, in frame order
+phases = ("events", "fill", "draw", "scale", "flip")
+
+def percentile(values:list[float], p:float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not values: return 0.0
+    index = min(len(values)-1, max(0, math.ceil(p/100*len(values))-1))
+    return values[index]
+
+class BenchmarkResult:
+    def __init__(self, name:str, frame_times:list[float], phase_times:dict[str, list[float]]) -> None:
+        self._name:str = name
+        self._frame_times:list[float] = sorted(frame_times)
+        self._phase_times:dict[str, list[float]] = {phase: sorted(times) for phase, times in phase_times.items()}
+
+    @property
+    def name(self) -> str: return self._name
+
+    @property
+    def frames(self) -> int: return len(self._frame_times)
+
+    @property
+    def p50(self) -> float: return percentile(self._frame_times, 50)
+
+    @property
+    def p95(self) -> float: return percentile(self._frame_times, 95)
+
+    @property
+    def p99(self) -> float: return percentile(self._frame_times, 99)
+
+    @property
+    def fps(self) -> float:
+        total = sum(self._frame_times)
+        return len(self._frame_times)/total if total else 0.0
+
+    def phase_mean(self, phase:str) -> float:
+        times = self._phase_times.get(phase, [])
+        return sum(times)/len(times) if times else 0.0
+
+    def phase_percentile(self, phase:str, p:float) -> float:
+        return percentile(self._phase_times.get(phase, []), p)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self._name,
+            "frames": self.frames,
+            "fps": self.fps,
+            "p50": self.p50,
+            "p95": self.p95,
+            "p99": self.p99,
+            "phases": {phase: {"mean": self.phase_mean(phase), "p95": self.phase_percentile(phase, 95)} for phase in self._phase_times},
+        }
+
+    def __str__(self) -> str:
+        ms = lambda t: f"{t*1000:7.3f}ms"
+        lines = [f"{fixed_len(self._name, 12)} {self.frames} frames, {self.fps:.0f} fps, p50 {ms(self.p50)} p95 {ms(self.p95)} p99 {ms(self.p99)}"]
+        for phase in self._phase_times:
+            lines.append(f"    {fixed_len(phase, 8)} mean {ms(self.phase_mean(phase))} p95 {ms(self.phase_percentile(phase, 95))}")
+        return "\n".join(lines)
+
+# Drives a headless game frame by frame, timing each phase of the loop
+class Benchmark:
+    def __init__(self, game:Game, frames:int=1000, warmup:int=100) -> None:
+        if not game.should_run():
+            raise RuntimeError("Game must be initialised before running a benchmark")
+        self._game:Game = game
+        self._frames:int = frames
+        self._warmup:int = warmup
+
+    def run(self, name:str, scene:Callable[[Game, int], None]) -> BenchmarkResult:
+        game = self._game
+        clock = time.perf_counter
+        frame_times:list[float] = []
+        phase_times:dict[str, list[float]] = {phase: [] for phase in phases}
+        for frame in range(self._warmup+self._frames):
+            t0 = clock()
+            game._pump_events()
+            t1 = clock()
+            game._clear_canvas()
+            t2 = clock()
+            scene(game, frame)
+            t3 = clock()
+            game._scale_canvas()
+            t4 = clock()
+            game._flip()
+            t5 = clock()
+            game._tick()
+            t6 = clock()
+            if frame<self._warmup: continue
+            frame_times.append(t6-t0)
+            for phase, start, end in zip(phases, (t0, t1, t2, t3, t4), (t1, t2, t3, t4, t5)):
+                phase_times[phase].append(end-start)
+        return BenchmarkResult(name, frame_times, phase_times)
+
+# =================================================
+# ================ Standard scenes ================
+# =================================================
+def scene_empty(game:Game, frame:int):
+    pass
+
+def scene_circle(game:Game, frame:int):
+    pygame.draw.circle(game._canvas, pygame.Color(255, 0, 0), (10, 10), 10)
+
+def _make_sprite(size:int) -> pygame.Surface:
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    surface.fill(Colors.orange.to_pygame)
+    return surface
+
+def make_scene_sprites(count:int=1000, size:int=16) -> Callable[[Game, int], None]:
+    surface = _make_sprite(size)
+    def scene(game:Game, frame:int):
+        canvas = game._canvas
+        w, h = canvas.get_size()
+        for i in range(count):
+            canvas.blit(surface, ((i*7+frame)%w, (i*13)%h))
+    return scene
+
+def make_scene_batch(count:int=1000, size:int=16, layers:int=4) -> Callable[[Game, int], None]:
+    texture = Texture("bench_sprite", surface=_make_sprite(size))
+    def scene(game:Game, frame:int):
+        w, h = game._canvas.get_size()
+        for i in range(count):
+            game.draw(texture, ((i*7+frame)%w, (i*13)%h), i%layers)
+        game.draw_frame()
+    return scene
+
+def make_scene_batch_many(count:int=1000, size:int=16) -> Callable[[Game, int], None]:
+    texture = Texture("bench_sprite", surface=_make_sprite(size))
+    def scene(game:Game, frame:int):
+        w, h = game._canvas.get_size()
+        game.draw_many(texture, [((i*7+frame)%w, (i*13)%h) for i in range(count)])
+        game.draw_frame()
+    return scene
+
+standard_scenes:dict[str, Callable[[Game, int], None]] = {
+    "empty": scene_empty,
+    "circle": scene_circle,
+    "sprites_1k": make_scene_sprites(1000),
+    "batch_1k": make_scene_batch(1000),
+    "batch_many_1k": make_scene_batch_many(1000),
+}
+
+def run_standard_benchmarks(frames:int=1000, warmup:int=100, scenes:dict[str, Callable[[Game, int], None]]=None) -> list[BenchmarkResult]:
+    game = GS.game if GS.game else Game("Benchmark", headless=True, target_fps=0)
+    if not game.should_run(): game.init()
+    benchmark = Benchmark(game, frames, warmup)
+    return [benchmark.run(name, scene) for name, scene in (scenes or standard_scenes).items()]
+
+if __name__ == "__main__":
+    # Usage: python -m engine.bench [frames]
+    frames = int(sys.argv[1]) if len(sys.argv)>1 else 1000
+    for result in run_standard_benchmarks(frames):
+        log(str(result), logLevel.timer)
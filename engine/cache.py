@@ -0,0 +1,100 @@
+import os
+import sys
+import mmap
+import zlib
+import struct
+import hashlib
+from .enums import *
+
+FROZEN = getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
+
+def default_cache_dir() -> str:
+    if not FROZEN:
+        return os.path.abspath(os.path.join(".cache", "assets"))
+    # The _MEIPASS folder is temporary, keep the cache in the user's cache folder
+    if sys.platform.startswith("win32"):
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "pixels", "assets")
+
+# On-disk cache of decoded RGBA pixels, entries are memory mapped and wrapped with frombuffer
+class DecodedCache:
+    _magic = b"PXC1"
+    # magic, source stamp, source size, width, height
+    _header = struct.Struct("<4sqqII")
+
+    def __init__(self, directory:str=None) -> None:
+        self._directory:str = directory if directory else default_cache_dir()
+        os.makedirs(self._directory, exist_ok=True)
+        self._hits:int = 0
+        self._misses:int = 0
+
+    @property
+    def directory(self) -> str: return self._directory
+
+    @property
+    def hits(self) -> int: return self._hits
+
+    @property
+    def misses(self) -> int: return self._misses
+
+    def load(self, path:str) -> pygame.Surface:
+        """
+        Decoded, unconverted surface of path, from the cache when the entry is still valid
+        """
+        st = os.stat(path)
+        stamp = self._stamp(path, st)
+        entry = self._entry_path(path)
+        surface = self._read(entry, stamp, st.st_size)
+        if surface is not None:
+            self._hits += 1
+            return surface
+        self._misses += 1
+        surface = pygame.image.load(path)
+        self._write(entry, stamp, st.st_size, surface)
+        return surface
+
+    def clear(self):
+        for file in os.listdir(self._directory):
+            if file.endswith(".pxc"):
+                os.remove(os.path.join(self._directory, file))
+
+    def _stamp(self, path:str, st:os.stat_result) -> int:
+        if not FROZEN: return st.st_mtime_ns
+        # Extracted bundles get fresh mtimes on every launch, fingerprint the content instead
+        with open(path, "rb") as f:
+            return zlib.crc32(f.read())
+
+    def _entry_path(self, path:str) -> str:
+        # Keyed on the path relative to the asset root so source and bundled layouts share the scheme
+        base = sys._MEIPASS if FROZEN else os.path.abspath(".") # type: ignore # pylint: disable=no-member
+        key = os.path.relpath(os.path.abspath(path), base).replace(os.sep, "/")
+        return os.path.join(self._directory, hashlib.sha1(key.encode("utf-8")).hexdigest()+".pxc")
+
+    def _read(self, entry:str, stamp:int, size:int) -> pygame.Surface:
+        try:
+            with open(entry, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mm)<self._header.size:
+            mm.close()
+            return None
+        magic, entry_stamp, entry_size, w, h = self._header.unpack_from(mm)
+        if magic!=self._magic or entry_stamp!=stamp or entry_size!=size or len(mm)!=self._header.size+w*h*4:
+            mm.close()
+            return None
+        # The surface keeps the mapping alive for as long as it references it
+        return pygame.image.frombuffer(memoryview(mm)[self._header.size:], (w, h), "RGBA")
+
+    def _write(self, entry:str, stamp:int, size:int, surface:pygame.Surface):
+        w, h = surface.get_size()
+        tmp = f"{entry}.{os.getpid()}.{id(surface)}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(self._header.pack(self._magic, stamp, size, w, h))
+                f.write(pygame.image.tobytes(surface, "RGBA"))
+            os.replace(tmp, entry)
+        except OSError:
+            if os.path.exists(tmp): os.remove(tmp)
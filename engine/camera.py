@@ -0,0 +1,150 @@
+import math
+from .enums import *
+
+# 2D camera looking at the world, position is the world point at the center of the view
+class Camera:
+    def __init__(self, viewport_size:vec2, position:vec2=vec2(0, 0), zoom:float=1.0, bounds:pygame.Rect=None) -> None:
+        self._viewport:tuple[int, int] = (int(viewport_size[0]), int(viewport_size[1]))
+        self._position:vec2 = vec2(position)
+        self._zoom:float = zoom
+        self._bounds:pygame.Rect = pygame.Rect(bounds) if bounds else None
+        # Scaled surfaces for zoom != 1, keyed by source surface
+        self._scaled:dict[pygame.Surface, pygame.Surface] = {}
+        self._max_scaled:int = 4096
+        self._origin:tuple[int, int] = (0, 0)
+        self._update_origin()
+
+    @property
+    def position(self) -> vec2: return vec2(self._position)
+    @position.setter
+    def position(self, value:vec2):
+        self._position.update(value[0], value[1])
+        self._update_origin()
+
+    @property
+    def zoom(self) -> float: return self._zoom
+    @zoom.setter
+    def zoom(self, value:float):
+        if value<=0: raise ValueError("Camera zoom must be positive")
+        if value!=self._zoom: self._scaled.clear()
+        self._zoom = value
+        self._update_origin()
+
+    @property
+    def bounds(self) -> pygame.Rect: return self._bounds
+    @bounds.setter
+    def bounds(self, value:pygame.Rect):
+        self._bounds = pygame.Rect(value) if value else None
+        self._update_origin()
+
+    @property
+    def viewport_size(self) -> tuple[int, int]: return self._viewport
+
+    @property
+    def origin(self) -> tuple[int, int]:
+        """
+        Screen pixel the world origin maps to, negated. Always whole pixels so pixel art doesn't shimmer
+        """
+        return self._origin
+
+    @property
+    def view_rect(self) -> pygame.Rect:
+        """
+        World area covered by the view, rounded outwards
+        """
+        ox, oy = self._origin
+        z = self._zoom
+        x0, y0 = math.floor(ox/z), math.floor(oy/z)
+        return pygame.Rect(x0, y0, math.ceil((ox+self._viewport[0])/z)-x0, math.ceil((oy+self._viewport[1])/z)-y0)
+
+    def move(self, delta:vec2) -> 'Camera':
+        self._position += delta
+        self._update_origin()
+        return self
+
+    def follow(self, target:vec2, dt:float, stiffness:float=8.0, dead_zone:vec2=vec2(0, 0)) -> 'Camera':
+        """
+        Ease towards target, frame rate independent. The camera doesn't move while target is within dead_zone of the center
+        """
+        dx, dy = target[0]-self._position.x, target[1]-self._position.y
+        dx = math.copysign(max(0.0, abs(dx)-dead_zone[0]), dx)
+        dy = math.copysign(max(0.0, abs(dy)-dead_zone[1]), dy)
+        t = 1-math.exp(-stiffness*dt)
+        self._position.x += dx*t
+        self._position.y += dy*t
+        self._update_origin()
+        return self
+
+    def world_to_screen(self, point:vec2) -> tuple[int, int]:
+        return (round(point[0]*self._zoom)-self._origin[0], round(point[1]*self._zoom)-self._origin[1])
+
+    def screen_to_world(self, point:vec2) -> vec2:
+        return vec2((point[0]+self._origin[0])/self._zoom, (point[1]+self._origin[1])/self._zoom)
+
+    def is_visible(self, x:float, y:float, w:float, h:float) -> bool:
+        z = self._zoom
+        sx, sy = x*z-self._origin[0], y*z-self._origin[1]
+        return sx<self._viewport[0] and sy<self._viewport[1] and sx+w*z>0 and sy+h*z>0
+
+    def query(self, index:'SpatialHash', mask:int=~0) -> list['Collider']:
+        """
+        Colliders of a spatial index overlapping the view, everything else can be skipped before drawing
+        """
+        view = self.view_rect
+        return index.query_rect(view.x, view.y, view.w, view.h, mask)
+
+    def submit(self, batch:'SpriteBatch', texture:'Texture', position:vec2, layer:int=0, flags:int=0) -> bool:
+        # Culled with the texture's size, so off-screen sprites don't reload evicted pixels or count as used
+        size = texture.size
+        screen = self._project(position, size[0], size[1])
+        if screen is None: return False
+        self._submit(batch, texture.surface, screen, layer, flags)
+        return True
+
+    def submit_surface(self, batch:'SpriteBatch', surface:pygame.Surface, position:vec2, layer:int=0, flags:int=0) -> bool:
+        """
+        Cull and transform a world space submission, returns False when it was rejected
+        """
+        w, h = surface.get_size()
+        screen = self._project(position, w, h)
+        if screen is None: return False
+        self._submit(batch, surface, screen, layer, flags)
+        return True
+
+    def _project(self, position:vec2, w:int, h:int) -> tuple[int, int]:
+        # Screen position of a w x h world space rect, None when it is outside the viewport
+        z = self._zoom
+        sx, sy = round(position[0]*z)-self._origin[0], round(position[1]*z)-self._origin[1]
+        if sx>=self._viewport[0] or sy>=self._viewport[1] or sx+w*z<=0 or sy+h*z<=0: return None
+        return (sx, sy)
+
+    def _submit(self, batch:'SpriteBatch', surface:pygame.Surface, screen:tuple[int, int], layer:int, flags:int):
+        if self._zoom!=1: surface = self._get_scaled(surface)
+        batch.submit_surface(surface, screen, layer, flags)
+
+    def clear_cache(self) -> 'Camera':
+        """
+        Drop the scaled copies, needed when source surfaces change in place
+        """
+        self._scaled.clear()
+        return self
+
+    def _get_scaled(self, surface:pygame.Surface) -> pygame.Surface:
+        scaled = self._scaled.get(surface)
+        if scaled is None:
+            if len(self._scaled)>=self._max_scaled: self._scaled.clear()
+            w, h = surface.get_size()
+            scaled = pygame.transform.scale(surface, (max(1, round(w*self._zoom)), max(1, round(h*self._zoom))))
+            self._scaled[surface] = scaled
+        return scaled
+
+    def _update_origin(self):
+        z = self._zoom
+        vw, vh = self._viewport[0]/z, self._viewport[1]/z
+        x, y = self._position.x-vw/2, self._position.y-vh/2
+        if self._bounds:
+            # Clamp the view inside bounds, centered on an axis where the bounds are smaller than the view
+            b = self._bounds
+            x = b.x+(b.w-vw)/2 if vw>=b.w else min(max(x, b.x), b.right-vw)
+            y = b.y+(b.h-vh)/2 if vh>=b.h else min(max(y, b.y), b.bottom-vh)
+        self._origin = (round(x*z), round(y*z))
@@ -0,0 +1,216 @@
+import math
+from typing import Iterable
+from .enums import *
+
+# Axis-aligned box collider, float coordinates so sub-pixel movement doesn't drift
+class Collider:
+    __slots__ = ("x", "y", "w", "h", "owner", "layer", "mask", "_cells", "_id")
+
+    def __init__(self, x:float, y:float, w:float, h:float, owner:object=None, layer:int=1, mask:int=~0) -> None:
+        self.x:float = x
+        self.y:float = y
+        self.w:float = w
+        self.h:float = h
+        self.owner:object = owner
+        # A pair is reported when either collider's mask matches the other's layer
+        self.layer:int = layer
+        self.mask:int = mask
+        self._cells:tuple[int, int, int, int] = None
+        self._id:int = -1
+
+    @property
+    def right(self) -> float: return self.x+self.w
+
+    @property
+    def bottom(self) -> float: return self.y+self.h
+
+    @property
+    def rect(self) -> pygame.Rect: return pygame.Rect(int(self.x), int(self.y), math.ceil(self.w), math.ceil(self.h))
+
+    def overlaps(self, other:'Collider') -> bool:
+        return self.x<other.x+other.w and other.x<self.x+self.w and self.y<other.y+other.h and other.y<self.y+self.h
+
+    def contains(self, x:float, y:float) -> bool:
+        return self.x<=x<self.x+self.w and self.y<=y<self.y+self.h
+
+    def ray_distance(self, ox:float, oy:float, dx:float, dy:float) -> float:
+        """
+        Distance along a normalised ray to the box (slab test), None on a miss
+        """
+        tmin, tmax = -math.inf, math.inf
+        for o, d, lo, hi in ((ox, dx, self.x, self.x+self.w), (oy, dy, self.y, self.y+self.h)):
+            if d==0:
+                if o<lo or o>=hi: return None
+                continue
+            t0, t1 = (lo-o)/d, (hi-o)/d
+            if t0>t1: t0, t1 = t1, t0
+            tmin, tmax = max(tmin, t0), min(tmax, t1)
+            if tmin>tmax: return None
+        if tmax<0: return None
+        return max(tmin, 0.0)
+
+# Uniform grid broad phase, colliders are only re-bucketed when they cross a cell boundary
+class SpatialHash:
+    def __init__(self, cell_size:int=32) -> None:
+        self._cell_size:int = cell_size
+        self._cells:dict[tuple[int, int], list[Collider]] = {}
+        self._colliders:dict[int, Collider] = {}
+        self._next_id:int = 0
+        # Cell range ever occupied (x0, y0, x1, y1), only grows until clear. Lets raycast stop once it leaves the grid
+        self._bounds:tuple[int, int, int, int] = None
+
+    @property
+    def cell_size(self) -> int: return self._cell_size
+
+    def __len__(self) -> int:
+        return len(self._colliders)
+
+    def __iter__(self):
+        return iter(self._colliders.values())
+
+    def add(self, collider:Collider) -> Collider:
+        if collider._id>=0: return collider
+        collider._id = self._next_id
+        self._next_id += 1
+        self._colliders[collider._id] = collider
+        collider._cells = self._cell_range(collider)
+        self._insert(collider, collider._cells)
+        return collider
+
+    def remove(self, collider:Collider):
+        if self._colliders.pop(collider._id, None) is None: return
+        self._erase(collider, collider._cells)
+        collider._id = -1
+        collider._cells = None
+
+    def move(self, collider:Collider, x:float, y:float):
+        collider.x, collider.y = x, y
+        self.update(collider)
+
+    def update(self, collider:Collider):
+        """
+        Call after changing a collider's position or size
+        """
+        cells = self._cell_range(collider)
+        if cells==collider._cells: return
+        self._erase(collider, collider._cells)
+        self._insert(collider, cells)
+        collider._cells = cells
+
+    def clear(self):
+        for collider in self._colliders.values():
+            collider._id = -1
+            collider._cells = None
+        self._cells.clear()
+        self._colliders.clear()
+        self._bounds = None
+
+    def pairs(self) -> list[tuple[Collider, Collider]]:
+        """
+        Every overlapping pair whose layers and masks match, each pair reported once
+        """
+        seen:set[tuple[int, int]] = set()
+        result:list[tuple[Collider, Collider]] = []
+        for bucket in self._cells.values():
+            n = len(bucket)
+            if n<2: continue
+            for i in range(n):
+                a = bucket[i]
+                for j in range(i+1, n):
+                    b = bucket[j]
+                    if not (a.mask & b.layer or b.mask & a.layer): continue
+                    key = (a._id, b._id) if a._id<b._id else (b._id, a._id)
+                    if key in seen: continue
+                    seen.add(key)
+                    if a.overlaps(b): result.append((a, b))
+        return result
+
+    def query_rect(self, x:float, y:float, w:float, h:float, mask:int=~0) -> list[Collider]:
+        probe = Collider(x, y, w, h)
+        return [collider for collider in self._candidates(self._cell_range(probe)) if collider.layer & mask and probe.overlaps(collider)]
+
+    def query_point(self, x:float, y:float, mask:int=~0) -> list[Collider]:
+        bucket = self._cells.get((math.floor(x/self._cell_size), math.floor(y/self._cell_size)), ())
+        return [collider for collider in bucket if collider.layer & mask and collider.contains(x, y)]
+
+    def raycast(self, origin:vec2, direction:vec2, max_distance:float, mask:int=~0) -> tuple[Collider, float]:
+        """
+        Closest collider hit by the ray and the distance to it, (None, max_distance) on a miss.
+        Walks the grid cells along the ray and stops at the first cell holding a hit or once no occupied cell is ahead,
+        so max_distance may be math.inf
+        """
+        length = math.hypot(direction[0], direction[1])
+        if length==0 or self._bounds is None: return (None, max_distance)
+        ox, oy = origin[0], origin[1]
+        dx, dy = direction[0]/length, direction[1]/length
+        size = self._cell_size
+        cx, cy = math.floor(ox/size), math.floor(oy/size)
+        step_x, step_y = (1 if dx>0 else -1), (1 if dy>0 else -1)
+        # Distance to the first cell boundary on each axis, and between two boundaries
+        t_max_x = ((cx+(step_x>0))*size-ox)/dx if dx else math.inf
+        t_max_y = ((cy+(step_y>0))*size-oy)/dy if dy else math.inf
+        t_delta_x = size/abs(dx) if dx else math.inf
+        t_delta_y = size/abs(dy) if dy else math.inf
+        best:Collider = None
+        best_t = max_distance
+        bx0, by0, bx1, by1 = self._bounds
+        t = 0.0
+        while t<=best_t:
+            if (cx<bx0 and dx<=0) or (cx>bx1 and dx>=0) or (cy<by0 and dy<=0) or (cy>by1 and dy>=0): break
+            for collider in self._cells.get((cx, cy), ()):
+                if not collider.layer & mask: continue
+                hit = collider.ray_distance(ox, oy, dx, dy)
+                if hit is not None and hit<best_t:
+                    best, best_t = collider, hit
+            if t_max_x<t_max_y:
+                t = t_max_x
+                t_max_x += t_delta_x
+                cx += step_x
+            else:
+                t = t_max_y
+                t_max_y += t_delta_y
+                cy += step_y
+        return (best, best_t)
+
+    def draw_debug(self, surface:pygame.Surface, offset:vec2=vec2(0, 0), color:Color=Colors.green) -> list[pygame.Rect]:
+        """
+        Outline every collider, returns the drawn rects
+        """
+        ox, oy = int(offset[0]), int(offset[1])
+        col = color.to_pygame
+        return [pygame.draw.rect(surface, col, collider.rect.move(ox, oy), 1) for collider in self._colliders.values()]
+
+    def _cell_range(self, collider:Collider) -> tuple[int, int, int, int]:
+        size = self._cell_size
+        # Right and bottom edges are exclusive
+        return (math.floor(collider.x/size), math.floor(collider.y/size), math.ceil((collider.x+collider.w)/size)-1, math.ceil((collider.y+collider.h)/size)-1)
+
+    def _insert(self, collider:Collider, cells:tuple[int, int, int, int]):
+        x0, y0, x1, y1 = cells
+        x1, y1 = max(x0, x1), max(y0, y1)
+        if self._bounds is None: self._bounds = (x0, y0, x1, y1)
+        else: self._bounds = (min(self._bounds[0], x0), min(self._bounds[1], y0), max(self._bounds[2], x1), max(self._bounds[3], y1))
+        for cy in range(y0, y1+1):
+            for cx in range(x0, x1+1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is None:
+                    bucket = self._cells[(cx, cy)] = []
+                bucket.append(collider)
+
+    def _erase(self, collider:Collider, cells:tuple[int, int, int, int]):
+        x0, y0, x1, y1 = cells
+        for cy in range(y0, max(y0, y1)+1):
+            for cx in range(x0, max(x0, x1)+1):
+                bucket = self._cells[(cx, cy)]
+                bucket.remove(collider)
+                if not bucket: del self._cells[(cx, cy)]
+
+    def _candidates(self, cells:tuple[int, int, int, int]) -> Iterable[Collider]:
+        x0, y0, x1, y1 = cells
+        seen:set[int] = set()
+        for cy in range(y0, max(y0, y1)+1):
+            for cx in range(x0, max(x0, x1)+1):
+                for collider in self._cells.get((cx, cy), ()):
+                    if collider._id not in seen:
+                        seen.add(collider._id)
+                        yield collider
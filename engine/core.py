@@ -3,16 +3,46 @@
 # =================================================
 import sys
 import os
+import time
 import uuid
-from collections import deque
+import weakref
+from collections import deque, OrderedDict
 from typing import Callable
 from .enums import *
 from .math import *
 from .utils import *
 from .io import *
-
-os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = '1'
+from .render import *
+from .atlas import *
+from .profiler import *
+from .tilemap import *
+from .collision import *
+from .animation import *
+from .camera import *
+from .loop import *
+from .audio import *
+from .text import *
 import pygame
+from . import startup_time as _startup_time
+
+# Engine import cost, from the package's first import (pygame included) to here
+_import_time:float = time.perf_counter()-_startup_time
+# Only the first game of a process reports it, later ones didn't pay for it
+_import_reported:bool = False
+
+# Optional subsystems are imported by the methods that use them, their names stay reachable from engine.core (PEP 562)
+_lazy_names = {
+    "HotReloader": "watcher", "FileWatcher": "watcher", "DecodedCache": "cache", "default_cache_dir": "cache",
+    "InputRecorder": "replay", "InputReplay": "replay", "recordedEvent": "replay", "LoadingJob": "loading",
+}
+
+def __getattr__(name:str):
+    if name in _lazy_names:
+        import importlib
+        value = getattr(importlib.import_module(f".{_lazy_names[name]}", __package__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # =================================================
@@ -29,6 +59,9 @@ else:
 def fire_event(event:'Event'):
     GS.game.fire_event(event)
 
+def queue_event(event:'Event', pool:'EventPool'=None):
+    GS.game.queue_event(event, pool)
+
 def on(event:'Event.__class__'):
     def decorator(func:Callable[['Event'], None]):
         GS.game.register_event_listener(EventListenerFunctionCallback(event, func))
@@ -44,42 +77,135 @@ class Settings:
     d_no_debug = False
     d_level = debugLevel.collisions
     d_max_frames = 100
+    # Debug builds log everything, installed builds stay at the logger's default (info)
+    d_log_level = logLevel.trace
+    # Per-phase frame profiler, costs nothing when disabled
+    d_profiler = False
+    d_profiler_overlay = False
+    # Log import, init and first frame timings once the first frame is presented
+    d_startup_report = True
+    # Seconds between window caption FPS updates, setting the caption is a window manager round trip
+    d_caption_interval = 0.5
 
-# GameState class, holds main global variables
+# GameState class, holds main global variables. They point at the current game, the module level helpers go through them
 class GS:
     game:'Game' = None
     rm:'ResourceManager' = None
 
 # Game class, should be alive for the entire app's lifetime
 class Game:
-    def __init__(self, name:str="New game", game_definition=vec2(128, 64), display_size:vec2=vec2(1280, 720), resizable:bool=True) -> None:
-        if GS.game: raise RuntimeError("Only one game instance allowed")
-        GS.game = self
+    def __init__(self, name:str="New game", game_definition=vec2(128, 64), display_size:vec2=vec2(1280, 720), resizable:bool=True, headless:bool=False, target_fps:int=60, dirty_rects:bool=False, integer_scale:bool=False, vsync:bool=False, pipelined:bool=False, make_current:bool=True, audio:bool=None, joystick:bool=False) -> None:
+        # Games that aren't current render offscreen and ignore the real event queue, so many can share a process
+        if not make_current and not headless: raise ValueError("Only the current game can open a window")
+        if make_current and GS.game: raise RuntimeError("Only one current game instance allowed")
+        self._owns_display:bool = make_current
         self._name = name
 
         self._definition:vec2 = game_definition
         self._display_size:vec2 = display_size
         self._temp_screen_size:vec2 = display_size
         self._resizable:bool = resizable
+        # Headless games run on SDL's dummy video driver, target_fps=0 leaves the loop uncapped
+        self._headless:bool = headless
+        self._target_fps:int = target_fps
+        # Vsync is a request the driver may refuse, target_fps still caps the loop so a refused one can't spin
+        self._vsync:bool = vsync
+        # Only the SDL subsystems the game uses are started, audio defaults to on for windowed games
+        self._audio:bool = not headless if audio is None else audio
+        self._joystick:bool = joystick
+        self._startup:StartupReport = StartupReport()
+        global _import_reported
+        if not _import_reported:
+            _import_reported = True
+            self._startup.add("imports", _import_time)
+        self._mixer:Mixer = None
+        self._reloader:'HotReloader' = None
+        # Tilemaps drawn by this game, weak so a dropped map isn't kept alive
+        self._tilemaps:weakref.WeakSet[TileMap] = weakref.WeakSet()
         self._clear_color:Color = Colors.gray
         self._screen:pygame.surface.Surface = None
         self._canvas:pygame.surface.Surface = pygame.surface.Surface(self._definition)
-        self._temp_screen:pygame.surface.Surface = None
+        # Where the scaled canvas lands on screen, and a view of the screen there, both cached on resize
+        self._integer_scale:bool = integer_scale
+        self._present_rect:pygame.Rect = None
+        self._present_target:pygame.surface.Surface = None
+        self._letterbox_color:Color = Colors.black
         self._pg_clock:pygame.time.Clock = pygame.time.Clock()
-        self._rm:ResourceManager = ResourceManager()
-        GS.rm = self._rm
+        self._rm:ResourceManager = ResourceManager(game=self)
+        if make_current: self.make_current()
+        self._batch:SpriteBatch = SpriteBatch()
+        # draw is the hottest call of a frame, binding the batch's submit saves a Python call per sprite
+        self.draw = self._batch.submit
+        # Dirty rectangles mode only rescales and presents the canvas regions that changed. The canvas is kept between
+        # frames and the batch repaints where its submissions differ from the previous frame, so static content costs nothing.
+        # Pipelined games alternate two canvases, there the canvas is redrawn and the last two frames' draws are presented
+        self._dirty_rects:bool = dirty_rects
+        self._dirty:list[pygame.Rect] = []
+        self._prev_dirty:list[pygame.Rect] = []
+        # Regions drawn straight onto the canvas (mark_dirty), restored from the batch on the next frame
+        self._direct:list[pygame.Rect] = []
+        self._prev_direct:list[pygame.Rect] = []
+        self._full_redraw:bool = True
+        self._update_rects:list[pygame.Rect] = None
+        # Pipelined mode presents frame N on a worker thread while frame N+1 is drawn into the other canvas.
+        # Scaling and flipping run in SDL with the GIL released, so they overlap with game logic
+        self._pipelined:bool = pipelined
+        self._retained:bool = dirty_rects and not pipelined
+        self._canvases:list[pygame.surface.Surface] = [self._canvas, pygame.surface.Surface(self._definition)] if pipelined else [self._canvas]
+        self._presenter:'ThreadPoolExecutor' = None
+        self._present_future:'Future' = None
 
         self._dt:float = 0
+        self._frame_count:int = 0
+        self._fps:float = 0
+        self._fps_time:float = 0
+        self._fps_frames:int = 0
         self._is_alive:bool = False
         self._event_listeners:dict[Event.__class__, list[EventListener]] = {}
+        # Listeners of an event class and all its bases, rebuilt lazily when listeners change
+        self._dispatch_table:dict[Event.__class__, tuple[EventListener, ...]] = {}
+        self._event_queue:deque[tuple[Event, EventPool]] = deque()
+        self._dts:deque[float] = None
+        self._debug:bool = False
+        self._collisions:SpatialHash = SpatialHash()
+        self._camera:Camera = None
+        self._profiler:Profiler = Profiler(Settings.d_max_frames, enabled=False)
+        self._recorder:'InputRecorder' = None
+        self._replay:'InputReplay' = None
     
     def init(self) -> 'Game':
-        pygame.init()
-        flags = pygame.RESIZABLE | pygame.DOUBLEBUF
-        self._screen = pygame.display.set_mode(self._display_size, flags)
-        self._temp_screen = self._screen.copy()
+        if self._headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        startup = self._startup.restart()
+        # pygame.init() would start every subsystem, audio and joystick discovery being the slow ones
+        pygame.display.init()
+        startup.mark("display init")
+        if self._audio:
+            try:
+                pygame.mixer.init()
+                self._mixer = Mixer()
+            except pygame.error as e:
+                log("Audio unavailable: {}", logLevel.warning, e)
+            startup.mark("audio init")
+        if self._joystick:
+            pygame.joystick.init()
+            startup.mark("joystick init")
+        if self._owns_display:
+            flags = pygame.DOUBLEBUF
+            if self._resizable and not self._headless:
+                flags |= pygame.RESIZABLE
+            self._screen = self._set_mode(flags)
+        else:
+            # Surface conversions still need a video mode, a 1x1 dummy one does
+            if not pygame.display.get_surface(): pygame.display.set_mode((1, 1))
+            self._screen = pygame.Surface(self._display_size)
         self._window_resize(EventWindowResize(self._display_size))
-        pygame.display.set_caption(self._name)
+        if self._owns_display: pygame.display.set_caption(self._name)
+        startup.mark("window")
+        if self._pipelined:
+            from concurrent.futures import ThreadPoolExecutor
+            self._presenter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="present")
 
         self._is_alive = True
 
@@ -93,113 +219,939 @@ class Game:
     def quit(self):
         self._is_alive = False
     
+    def close(self):
+        """
+        Shut the game down right away instead of waiting for the loop to reach end_frame
+        """
+        self._is_alive = False
+        self._exit()
+    
+    def make_current(self) -> 'Game':
+        """
+        Point GS and the module level helpers (on, fire_event, queue_event) at this game
+        """
+        GS.game = self
+        GS.rm = self._rm
+        return self
+    
+    @property
+    def is_current(self) -> bool: return GS.game is self
+    
+    @property
+    def headless(self) -> bool: return self._headless
+    
+    @property
+    def screen(self) -> pygame.Surface: return self._screen
+    
+    @property
+    def rm(self) -> 'ResourceManager': return self._rm
+    
+    @property
+    def frame_count(self) -> int: return self._frame_count
+    
+    @property
+    def startup_report(self) -> StartupReport: return self._startup
+    
+    @property
+    def mixer(self) -> Mixer:
+        """
+        None when audio is disabled or unavailable
+        """
+        return self._mixer
+    
+    def enable_hot_reload(self, paths:list[str]="assets", interval:float=0.5, load_new:bool=True) -> 'HotReloader':
+        """
+        Watch asset folders and swap changed files into the loaded assets, EventAssetReloaded is fired for each one.
+        Tilemaps drawn with draw_tilemap re-render their chunks, others can forward the event to TileMap.asset_reloaded
+        """
+        from .io import convert_path
+        from .watcher import HotReloader
+        self.disable_hot_reload()
+        paths = [paths] if isinstance(paths, str) else paths
+        self._reloader = HotReloader(self._rm, [convert_path(path) for path in paths], interval, load_new, self._asset_reloaded)
+        log("Hot reload watching {} ({})", logLevel.trace, ", ".join(paths), self._reloader.watcher.backend)
+        return self._reloader
+    
+    def disable_hot_reload(self) -> 'Game':
+        if self._reloader:
+            self._reloader.close()
+            self._reloader = None
+        return self
+    
+    def _asset_reloaded(self, asset:'Asset'):
+        # Caches keyed by surface may hold copies of the old pixels
+        self._batch.clear_cache()
+        if self._camera: self._camera.clear_cache()
+        self._full_redraw = True
+        for tilemap in self._tilemaps: tilemap.asset_reloaded(asset)
+        if self._mixer and isinstance(asset, Music): self._mixer.reload_music(asset)
+        log("Reloaded {}", logLevel.trace, asset.name)
+        self.fire_event(EventAssetReloaded(asset))
+    
+    def play_sound(self, sound:'Sound|str', priority:int=None, volume:float=1.0, loops:int=0) -> pygame.mixer.Channel:
+        """
+        Play a sound (or the name of a loaded one), silently does nothing without audio
+        """
+        if self._mixer is None: return None
+        if isinstance(sound, str): sound = self._rm.get_sound(sound)
+        return self._mixer.play(sound, priority, volume, loops)
+    
+    def play_music(self, music:'Music|str', loops:int=-1, fade_ms:int=0) -> 'Game':
+        if self._mixer is None: return self
+        if isinstance(music, str): music = self._rm.get_music(music)
+        if music: self._mixer.play_music(music, loops, fade_ms)
+        return self
+
+    @property
+    def target_fps(self) -> int: return self._target_fps
+    @target_fps.setter
+    def target_fps(self, value:int): self._target_fps = int(value)
+    
+    @property
+    def batch(self) -> SpriteBatch: return self._batch
+
+    @property
+    def canvas(self) -> pygame.Surface:
+        """
+        Surface drawn this frame. In pipelined mode it alternates between two surfaces, don't keep it across frames
+        """
+        return self._canvas
+
+    @property
+    def pipelined(self) -> bool: return self._pipelined
+
+    def draw(self, texture:'Texture', position:vec2, layer:int=0, flags:int=drawFlags.none) -> SpriteBatch:
+        return self._batch.submit(texture, position, layer, flags)
+
+    def draw_many(self, texture:'Texture', positions:list[vec2], layer:int=0, flags:int=drawFlags.none) -> SpriteBatch:
+        return self._batch.submit_many(texture, positions, layer, flags)
+
+    @property
+    def camera(self) -> Camera: return self._camera
+    @camera.setter
+    def camera(self, camera:Camera): self._camera = camera
+
+    def draw_world(self, texture:'Texture', position:vec2, layer:int=0, flags:int=drawFlags.none) -> bool:
+        """
+        Draw at a world position through the camera, returns False when culled.
+        Without a camera world and canvas coordinates are the same
+        """
+        if self._camera is None:
+            self._batch.submit(texture, position, layer, flags)
+            return True
+        return self._camera.submit(self._batch, texture, position, layer, flags)
+
+    def draw_text(self, font:'Font', text:str, position:vec2, color:Color=Colors.white, layer:int=0, cache:bool=True) -> pygame.Rect:
+        """
+        Draw text on the canvas, see Font.draw
+        """
+        return font.draw(self._batch, text, position, color, layer, cache)
+    
+    def draw_particles(self, system:'ParticleSystem', offset:vec2=vec2(0, 0)) -> 'Game':
+        """
+        Write a particle system straight into the canvas, over whatever was drawn so far
+        """
+        rect = system.draw(self._canvas, offset)
+        if rect: self.mark_dirty(rect)
+        return self
+
+    def draw_tilemap(self, tilemap:TileMap, position:vec2=vec2(0, 0), layer:int=0) -> int:
+        """
+        Submit the chunks of tilemap visible on the canvas (through the camera if any), returns how many were drawn
+        """
+        # Remembered so hot reloads can drop chunks rendered from old tile art
+        self._tilemaps.add(tilemap)
+        camera = self._camera
+        if camera is None:
+            return tilemap.draw(self._batch, position, self._canvas.get_rect(), layer)
+        span = tilemap.chunk_span
+        ox, oy = int(position[0]), int(position[1])
+        count = 0
+        for cx, cy in tilemap.visible_chunks(camera.view_rect.move(-ox, -oy)):
+            surface = tilemap.get_chunk(cx, cy)
+            if surface and camera.submit_surface(self._batch, surface, (ox+cx*span, oy+cy*span), layer): count += 1
+        return count
+    
+    @property
+    def dt(self) -> float: return self._dt
+    
+    @property
+    def fps(self) -> float:
+        """
+        Frame rate averaged over the last Settings.d_caption_interval
+        """
+        return self._fps
+    
+    def run(self, update:Callable[[float], None], render:Callable[[float], None]=None, tick_rate:float=120) -> GameLoop:
+        """
+        Run until quit with update(dt) at a fixed tick_rate and render(alpha) once per displayed frame
+        """
+        loop = GameLoop(self, update, render, tick_rate)
+        loop.run()
+        return loop
+    
+    def start_recording(self, path:str) -> 'InputRecorder':
+        """
+        Write the input events and delta of every frame to path until stop_recording
+        """
+        self.stop_recording()
+        from .replay import InputRecorder
+        self._recorder = InputRecorder(path)
+        return self._recorder
+    
+    def stop_recording(self) -> 'Game':
+        if self._recorder:
+            self._recorder.close()
+            self._recorder = None
+        return self
+    
+    def start_replay(self, path:str, quit_on_end:bool=True) -> 'InputReplay':
+        """
+        Feed a recorded input log through the event pump instead of the real input, as fast as possible
+        """
+        from .replay import InputReplay
+        self._replay = InputReplay(path, quit_on_end)
+        return self._replay
+    
+    @property
+    def profiler(self) -> Profiler: return self._profiler
+
+    @property
+    def collisions(self) -> SpatialHash: return self._collisions
+    
+    def profile(self, name:str):
+        """
+        Time a block of user code: with game.profile("ai"): ...
+        """
+        return self._profiler.scope(name)
+    
+    @property
+    def integer_scale(self) -> bool: return self._integer_scale
+    @integer_scale.setter
+    def integer_scale(self, value:bool):
+        self._integer_scale = value
+        if self._screen: self._window_resize(EventWindowResize(self._display_size))
+    
+    def set_letterbox_color(self, color:Color) -> 'Game':
+        self._letterbox_color = color
+        if self._screen: self._window_resize(EventWindowResize(self._display_size))
+        return self
+    
     def set_clear_color(self, color:Color) -> 'Game':
         self._clear_color = color
+        self._full_redraw = True
+        return self
+    
+    def mark_dirty(self, rect:pygame.Rect) -> 'Game':
+        """
+        Flag a canvas region as changed, needed in dirty rectangles mode for anything not drawn through the batch.
+        Such draws should come after draw_frame, the batch repaints the regions it changed
+        """
+        if self._dirty_rects:
+            rect = pygame.Rect(rect)
+            self._dirty.append(rect)
+            if self._retained: self._direct.append(rect)
         return self
     
+    def mark_all_dirty(self) -> 'Game':
+        self._full_redraw = True
+        return self
+    
+    def on(self, event:'Event.__class__'):
+        """
+        Decorator registering a function as a listener on this game, unlike the module level on
+        """
+        def decorator(func:Callable[['Event'], None]):
+            self.register_event_listener(EventListenerFunctionCallback(event, func))
+            return func
+        return decorator
+    
     def register_event_listener(self, event_listener:'EventListener') -> 'Game':
         cl = event_listener._event_class
         if cl not in self._event_listeners:
             self._event_listeners[cl] = []
         self._event_listeners[cl].append(event_listener)
+        self._dispatch_table.clear()
+        return self
+    
+    def unregister_event_listener(self, event_listener:'EventListener') -> 'Game':
+        listeners = self._event_listeners.get(event_listener._event_class)
+        if listeners and event_listener in listeners:
+            listeners.remove(event_listener)
+            self._dispatch_table.clear()
         return self
     
     def fire_event(self, event:'Event') -> 'Game':
-        if event.__class__ in self._event_listeners:
-            for listener in self._event_listeners[event.__class__]:
-                listener.trigger(event)
+        listeners = self._dispatch_table.get(event.__class__)
+        if listeners is None:
+            listeners = self._build_dispatch(event.__class__)
+        for listener in listeners:
+            listener.trigger(event)
+            if event._consumed: break
+        return self
+    
+    def queue_event(self, event:'Event', pool:'EventPool'=None) -> 'Game':
+        """
+        Defer an event to the next flush, pooled events are released once dispatched
+        """
+        self._event_queue.append((event, pool))
+        return self
+    
+    def flush_events(self) -> 'Game':
+        # Events queued by listeners during the flush wait for the next one
+        queue = self._event_queue
+        fire = self.fire_event
+        for _ in range(len(queue)):
+            event, pool = queue.popleft()
+            fire(event)
+            if pool: pool.release(event)
         return self
     
+    def _build_dispatch(self, event_class:'Event.__class__') -> tuple['EventListener', ...]:
+        # Most derived listeners first, so they can consume the event before base class listeners see it
+        listeners:list[EventListener] = []
+        for cl in event_class.__mro__:
+            listeners.extend(self._event_listeners.get(cl, ()))
+        self._dispatch_table[event_class] = tuple(listeners)
+        return self._dispatch_table[event_class]
+    
     def begin_frame(self):
         if not self._is_alive: return
-        events:list[pygame.event.Event] = pygame.event.get()
+        if self._profiler._enabled: return self._begin_frame_profiled()
+        self._pump_events()
+        self.flush_events()
+        self._clear_canvas()
+    
+    def draw_frame(self):
+        if self._profiler._enabled:
+            with self._profiler.scope("draw"):
+                self._draw_batch()
+            return
+        self._draw_batch()
+    
+    def end_frame(self):
+        if not self._is_alive:
+            self._exit()
+            return
+        if self._debug: self._draw_debug()
+        if self._pipelined: return self._end_frame_pipelined()
+        if self._profiler._enabled: return self._end_frame_profiled()
+        self._scale_canvas()
+        self._flip()
+        self._tick()
+    
+    def _begin_frame_profiled(self):
+        profiler = self._profiler
+        profiler.begin_frame()
+        with profiler.scope("events"):
+            self._pump_events()
+            self.flush_events()
+        with profiler.scope("fill"):
+            self._clear_canvas()
+    
+    def _end_frame_profiled(self):
+        profiler = self._profiler
+        if Settings.d_profiler_overlay:
+            rect = pygame.Rect(0, self._canvas.get_height()-16, min(64, self._canvas.get_width()), 16)
+            profiler.draw_overlay(self._canvas, rect, 1/self._target_fps if self._target_fps else 1/60)
+            self.mark_dirty(rect)
+        with profiler.scope("scale"):
+            self._scale_canvas()
+        with profiler.scope("flip"):
+            self._flip()
+        profiler.end_frame()
+        self._tick()
+    
+    def _end_frame_pipelined(self):
+        profiler = self._profiler
+        if profiler._enabled and Settings.d_profiler_overlay:
+            rect = pygame.Rect(0, self._canvas.get_height()-16, min(64, self._canvas.get_width()), 16)
+            profiler.draw_overlay(self._canvas, rect, 1/self._target_fps if self._target_fps else 1/60)
+            self.mark_dirty(rect)
+        # Only the wait is timed here, the profiler isn't thread safe and the present itself runs on the worker
+        with profiler.scope("present_wait"):
+            self._wait_present()
+        canvas = self._canvas
+        self._present_future = self._presenter.submit(self._present, canvas, self._take_dirty())
+        self._canvas = self._canvases[1] if canvas is self._canvases[0] else self._canvases[0]
+        if profiler._enabled: profiler.end_frame()
+        self._tick()
+    
+    def _wait_present(self):
+        """
+        Block until the frame in flight is on screen, needed before touching the screen or the canvas being presented
+        """
+        future = self._present_future
+        if future is None: return
+        self._present_future = None
+        future.result()
+    
+    def _present(self, canvas:pygame.Surface, dirty:list[pygame.Rect]):
+        # Runs on the present thread, must not touch state the main thread writes
+        rects = self._scale(canvas, dirty)
+        if not self._owns_display: return
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+    
+    # Frame phases, split so they can be timed individually (see engine.bench)
+    def _pump_events(self):
+        events:list[pygame.event.Event] = pygame.event.get() if self._owns_display else []
+        if self._replay:
+            events = self._replay.next_events()
+        if self._recorder:
+            self._recorder.record_events(events)
         for event in events:
             if event.type == pygame.QUIT:
                 self.quit()
-                fire_event(EventQuit())
+                self.fire_event(EventQuit())
             elif event.type == pygame.KEYDOWN:
-                fire_event(EventKeydown(event.key))
+                self.fire_event(EventKeydown(event.key))
             elif event.type == pygame.KEYUP:
-                fire_event(EventKeyup(event.key))
+                self.fire_event(EventKeyup(event.key))
             elif event.type == pygame.VIDEORESIZE:
                 e = EventWindowResize(vec2(event.w, event.h))
                 self._window_resize(e)
                 self.fire_event(e)
-        
-        self._canvas.fill(self._clear_color.to_pygame)
-
+        if self._reloader: self._reloader.poll()
     
-    def draw_frame(self):
-        pygame.draw.circle(self._canvas, pygame.Color(255, 0, 0), (10, 10), 10)
+    def _draw_batch(self):
+        if not self._retained:
+            self._batch.flush(self._canvas, self._dirty if self._dirty_rects else None)
+            return
+        rects = self._batch.flush_changes(self._canvas, self._clear_color.to_pygame, self._full_redraw)
+        if rects is None: self._full_redraw = True
+        else: self._dirty.extend(rects)
     
-    def end_frame(self):
-        if not self._is_alive:
-            self._exit()
+    def _clear_canvas(self):
+        if not self._retained or self._full_redraw:
+            self._canvas.fill(self._clear_color.to_pygame)
+            self._direct.clear()
             return
+        # Erase last frame's direct draws, the rest of the canvas is still valid
+        self._prev_direct, self._direct = self._direct, self._prev_direct
+        self._direct.clear()
+        if self._prev_direct:
+            self._batch.repaint(self._canvas, self._clear_color.to_pygame, self._prev_direct)
+            self._dirty.extend(self._prev_direct)
+    
+    def _scale_canvas(self):
+        self._update_rects = self._scale(self._canvas, self._take_dirty())
+    
+    def _take_dirty(self) -> list[pygame.Rect]:
+        """
+        Canvas regions changed since the last present, None when the whole canvas has to be rescaled
+        """
+        dirty = None
+        if self._retained:
+            dirty = list(self._dirty)
+            self._dirty.clear()
+        elif self._dirty_rects:
+            dirty = self._dirty+self._prev_dirty
+            self._prev_dirty, self._dirty = self._dirty, self._prev_dirty
+            self._dirty.clear()
+        if self._full_redraw: dirty = None
+        self._full_redraw = False
+        return dirty
+    
+    def _scale(self, canvas:pygame.Surface, dirty:list[pygame.Rect]) -> list[pygame.Rect]:
+        if dirty is not None:
+            rects = self._scale_dirty(canvas, dirty)
+            if rects is not None: return rects
+        # Scaling straight into the screen view saves an intermediate surface and a full screen blit
+        pygame.transform.scale(canvas, self._present_rect.size, self._present_target)
+        return None
+    
+    def _scale_dirty(self, canvas:pygame.Surface, dirty:list[pygame.Rect]) -> list[pygame.Rect]:
+        """
+        Rescale only the dirty canvas regions, returns the screen rects to update or None if the whole canvas has to be rescaled
+        """
+        sx = self._present_rect.w/self._definition.x
+        sy = self._present_rect.h/self._definition.y
+        # At a fractional scale each canvas pixel covers a varying number of screen pixels, and a region scaled
+        # on its own rounds differently from the full scale, leaving seams. Only whole multiples line up
+        if not (sx.is_integer() and sy.is_integer()): return None
+        canvas_rect = canvas.get_rect()
+        merged:list[pygame.Rect] = []
+        area = 0
+        for rect in dirty:
+            rect = rect.clip(canvas_rect)
+            if not rect: continue
+            index = rect.collidelist(merged)
+            while index!=-1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        for rect in merged: area += rect.w*rect.h
+        if area*2>canvas_rect.w*canvas_rect.h: return None
 
-        pygame.transform.scale(self._canvas, self._temp_screen_size, self._temp_screen)
-        delta = (self._temp_screen_size-self._display_size)/2
-        self._screen.blit(self._temp_screen, -delta)
-        pygame.display.flip()
-        fps = 1000/self._pg_clock.tick(60)
-        pygame.display.set_caption(f"{self._name} - FPS: {fps:.0f}")
+        sx, sy = int(sx), int(sy)
+        ox, oy = self._present_rect.topleft
+        target = self._present_target
+        rects:list[pygame.Rect] = []
+        for rect in merged:
+            area = pygame.Rect(rect.x*sx, rect.y*sy, rect.w*sx, rect.h*sy)
+            pygame.transform.scale(canvas.subsurface(rect), area.size, target.subsurface(area))
+            rects.append(area.move(ox, oy))
+        return rects
+    
+    def _set_mode(self, flags:int) -> pygame.Surface:
+        # No SCALED flag, the engine does its own scaling and letterboxing. Vsync is a request, target_fps still caps the loop
+        if not self._vsync: return pygame.display.set_mode(self._display_size, flags)
+        try:
+            screen = pygame.display.set_mode(self._display_size, flags, vsync=1)
+        except pygame.error as e:
+            log("Vsync refused ({}), frames are paced by target_fps", logLevel.warning, e)
+            return pygame.display.set_mode(self._display_size, flags)
+        # Only pygame-ce reports whether the request took, pygame may ignore it silently
+        if hasattr(pygame.display, "is_vsync") and not pygame.display.is_vsync():
+            log("Vsync unavailable for this window, frames are paced by target_fps", logLevel.warning)
+        return screen
+    
+    def _flip(self):
+        if not self._owns_display: return
+        if self._update_rects is None:
+            pygame.display.flip()
+        elif self._update_rects:
+            pygame.display.update(self._update_rects)
+    
+    def _tick(self):
+        if self._replay:
+            self._pg_clock.tick(0)
+            self._dt = self._replay.end_frame()
+        else:
+            self._dt = self._pg_clock.tick(self._target_fps)/1000
+        if self._recorder:
+            self._recorder.end_frame(self._dt)
+        self._frame_count += 1
+        self._rm._frame += 1
+        if self._frame_count==1: self._first_frame()
+        if self._dts is not None:
+            self._dts.append(self._dt)
+        self._fps_time += self._dt
+        self._fps_frames += 1
+        if self._fps_time<Settings.d_caption_interval: return
+        self._fps = self._fps_frames/self._fps_time
+        self._fps_time = 0
+        self._fps_frames = 0
+        if self._headless or not self._owns_display: return
+        pygame.display.set_caption(f"{self._name} - FPS: {self._fps:.0f}")
+    
+    def _first_frame(self):
+        self._startup.mark("first frame")
+        if self._debug and Settings.d_startup_report:
+            log(str(self._startup), logLevel.timer)
+    
+    def _draw_debug(self):
+        if Settings.d_level & debugLevel.collisions and len(self._collisions):
+            for rect in self._collisions.draw_debug(self._canvas):
+                self.mark_dirty(rect)
     
     def _init_debug(self) -> 'Game':
-        self._dts:deque[float] = deque(maxlen=Settings.d_max_frames)
+        self._debug = True
+        self._dts = deque(maxlen=Settings.d_max_frames)
+        set_log_level(Settings.d_log_level)
+        self._profiler.enabled = Settings.d_profiler
         return self
     
     def _window_resize(self, event:'EventWindowResize'):
+        self._wait_present()
         self._display_size = event.size
         screen_ratio = self._display_size.y/self._display_size.x
         game_ratio = self._definition.y/self._definition.x
-        if screen_ratio<game_ratio:
+        scale = min(int(self._display_size.x)//int(self._definition.x), int(self._display_size.y)//int(self._definition.y))
+        if self._integer_scale and scale>=1:
+            # Largest whole multiple of the canvas, every game pixel becomes a scale x scale square
+            self._temp_screen_size = vec2(int(self._definition.x)*scale, int(self._definition.y)*scale)
+        elif screen_ratio<game_ratio:
             self._temp_screen_size = vec2(int(self._display_size.y/game_ratio), int(self._display_size.y))
         else:
             self._temp_screen_size = vec2(int(self._display_size.x), int(self._display_size.x*game_ratio))
-        self._temp_screen = pygame.transform.scale(self._temp_screen, self._temp_screen_size)
+        if self._owns_display:
+            screen = pygame.display.get_surface()
+            if screen: self._screen = screen
+        elif self._screen.get_size()!=(int(self._display_size.x), int(self._display_size.y)):
+            self._screen = pygame.Surface(self._display_size)
+        offset = (self._display_size-self._temp_screen_size)/2
+        self._present_rect = pygame.Rect(int(offset.x), int(offset.y), int(self._temp_screen_size.x), int(self._temp_screen_size.y)).clip(self._screen.get_rect())
+        # Letterbox borders are drawn once here, frames only touch the present rect
+        self._screen.fill(self._letterbox_color.to_pygame)
+        self._present_target = self._screen.subsurface(self._present_rect)
+        self._full_redraw = True
 
     def _exit(self):
         if self._is_alive:
             raise RuntimeError("Internal exit called, but exit flag isn't set")
-        pygame.quit()
+        self.stop_recording()
+        self.disable_hot_reload()
+        if self._presenter:
+            self._wait_present()
+            self._presenter.shutdown()
+            self._presenter = None
+        if GS.game is self:
+            GS.game = None
+            GS.rm = None
+        # Offscreen games leave pygame to whoever owns the display
+        if self._owns_display: pygame.quit()
 
 # Holds buffers to prevent reloading from disk
 class ResourceManager:
-    def __init__(self) -> None:
+    def __init__(self, memory_budget:int=0, game:'Game'=None) -> None:
+        # Owning game, for the mixer that may still be playing an unloaded sound
+        self._game:Game = game
         self._textures:dict[str, Texture] = {}
+        self._textures_by_id:dict[uuid.UUID, Texture] = {}
+        self._spritesheets:dict[str, SpriteSheet] = {}
+        self._sounds:dict[str, Sound] = {}
+        self._music:dict[str, Music] = {}
+        self._fonts:dict[str, Font] = {}
+        self._cache:'DecodedCache' = None
+        # Unreferenced textures that can be reloaded from disk, least recently used first, evicted when over budget (0 means no budget).
+        # Atlas regions share their page and are never listed
+        self._unreferenced:OrderedDict[uuid.UUID, Texture] = OrderedDict()
+        # Set while a folder or atlas is registered, the budget is checked once at the end
+        self._defer_evict:bool = False
+        # Advanced by the game every frame, textures stamp it when used so drawing counts as a use
+        self._frame:int = 0
+        self._memory_budget:int = memory_budget
+        self._memory_used:int = 0
+        # Sound buffers can't be evicted, they are accounted apart from the texture budget
+        self._sound_memory:int = 0
+    
+    @property
+    def memory_used(self) -> int: return self._memory_used
+
+    @property
+    def sound_memory(self) -> int: return self._sound_memory
+
+    @property
+    def memory_budget(self) -> int: return self._memory_budget
+    @memory_budget.setter
+    def memory_budget(self, value:int):
+        self._memory_budget = int(value)
+        self._evict()
+    
+    def enable_cache(self, directory:str=None) -> 'ResourceManager':
+        """
+        Keep decoded pixels on disk so later launches skip image decoding
+        """
+        from .cache import DecodedCache
+        self._cache = DecodedCache(directory)
+        return self
+    
+    def _decode(self, path:str) -> pygame.Surface:
+        # Thread safe, the display dependent conversion is left to the caller
+        if self._cache: return self._cache.load(path)
+        return pygame.image.load(path)
     
     def load_texture(self, path:str, name:str=None) -> 'Texture':
-        from .io import convert_path, get_name_from_path, fixed_len
+        from .io import convert_path, get_name_from_path
         _path = convert_path(path)
-        surface = pygame.image.load(path).convert_alpha()
+        surface = self._decode(_path).convert_alpha()
         _name:str = None
         if name: _name = name
         else: _name = get_name_from_path(_path)
+        return self._add_texture(_name, _path, surface)
+    
+    def _add_texture(self, name:str, path:str, surface:pygame.Surface) -> 'Texture':
+        from .io import fixed_len
         id = uuid.uuid4()
         size = vec2(int(surface.get_width()), int(surface.get_height()))
-        log(f"Loaded texture {color(fixed_len(_name, 10), Colors.blue)}   {color(fixed_len(str(int(size.x))+'x'+str(int(size.y)), 9), Colors.lightgray)} {color(_path, Colors.lightgray)}", logLevel.trace)
-        texture = Texture(_name, _path, surface, size)
-        self._textures[_name] = texture
+        if log_enabled(logLevel.trace):
+            log(f"Loaded texture {color(fixed_len(name, 10), Colors.blue)}   {color(fixed_len(str(int(size.x))+'x'+str(int(size.y)), 9), Colors.lightgray)} {color(path, Colors.lightgray)}", logLevel.trace)
+        if name in self._textures: self.unload(name)
+        texture = Texture(name, path, surface, size)
+        texture.id = id
+        texture._manager = self
+        texture._last_used = self._frame
+        self._textures[name] = texture
+        self._textures_by_id[id] = texture
+        self._memory_used += texture.byte_size
+        if self._evictable(texture): self._unreferenced[id] = texture
+        self._evict()
+        return texture
     
     def get_texture(self, name:str) -> 'Texture':
-        if name in self._textures:
-            return self._textures[name]
-        return None
+        texture = self._textures.get(name)
+        if texture and texture._refcount==0 and texture._id in self._unreferenced:
+            texture._last_used = self._frame
+            self._unreferenced.move_to_end(texture._id)
+        return texture
 
-    def get_texture_from_id(self, id:int) -> 'Texture':
-        for texture in self._textures.values():
-            if texture.id==id: return texture
+    def get_texture_from_id(self, id:uuid.UUID) -> 'Texture':
+        texture = self._textures_by_id.get(id)
+        if texture and texture._refcount==0 and id in self._unreferenced:
+            texture._last_used = self._frame
+            self._unreferenced.move_to_end(id)
+        return texture
+    
+    def acquire(self, name:str) -> 'TextureHandle':
+        """
+        Reference counted handle, the texture can't be evicted until every handle is released
+        """
+        texture = self._textures.get(name)
+        if texture is None: return None
+        if texture._refcount==0:
+            self._unreferenced.pop(texture._id, None)
+        texture._refcount += 1
+        return TextureHandle(texture)
+    
+    def _release(self, texture:'Texture'):
+        texture._refcount -= 1
+        if texture._refcount==0 and self._textures_by_id.get(texture._id) is texture and self._evictable(texture):
+            self._unreferenced[texture._id] = texture
+            self._evict()
+    
+    def unload(self, name:str) -> bool:
+        texture = self._textures.pop(name, None)
+        if texture is None: return False
+        self._textures_by_id.pop(texture._id, None)
+        self._unreferenced.pop(texture._id, None)
+        if texture._surface is not None: self._memory_used -= texture.byte_size
+        return True
+    
+    def _evictable(self, texture:'Texture') -> bool:
+        surface = texture._surface
+        return bool(texture._path) and (surface is None or surface.get_parent() is None)
+    
+    def _evict(self, keep:'Texture'=None):
+        if not self._memory_budget or self._defer_evict: return
+        # Least recently drawn or fetched first, every listed texture frees its memory
+        kept:Texture = None
+        while self._memory_used>self._memory_budget and self._unreferenced:
+            id, texture = self._unreferenced.popitem(last=False)
+            if texture is keep:
+                kept = texture
+                continue
+            self._memory_used -= texture.byte_size
+            texture._surface = None
+            log("Evicted texture {}", logLevel.trace, texture._name)
+        if kept: self._unreferenced[kept._id] = kept
+    
+    def _reload_texture(self, texture:'Texture'):
+        texture._surface = self._decode(texture._path).convert_alpha()
+        self._memory_used += texture.byte_size
+        if texture._refcount==0:
+            self._unreferenced[texture._id] = texture
+            self._unreferenced.move_to_end(texture._id)
+        # The texture being accessed stays loaded even if it alone exceeds the budget
+        self._evict(texture)
+    
+    def load_sound(self, path:str, name:str=None, priority:int=0, max_voices:int=4, min_interval:float=0.0, volume:float=1.0) -> 'Sound':
+        """
+        Decode a short sound once, every play shares the buffer. Without an initialized mixer the sound is silent
+        """
+        from .io import convert_path, get_name_from_path
+        _path = convert_path(path)
+        _name = name if name else get_name_from_path(_path)
+        buffer:pygame.mixer.Sound = None
+        if pygame.mixer.get_init():
+            buffer = pygame.mixer.Sound(_path)
+        else:
+            log("Mixer not initialized, {} will be silent", logLevel.trace, _name)
+        if _name in self._sounds: self.unload_sound(_name)
+        sound = Sound(_name, _path, buffer, priority, max_voices, min_interval, volume)
+        sound.id = uuid.uuid4()
+        self._sounds[_name] = sound
+        self._sound_memory += sound.byte_size
+        log("Loaded sound {} ({:.2f}s)", logLevel.trace, _name, sound.length)
+        return sound
+    
+    def get_sound(self, name:str) -> 'Sound':
+        return self._sounds.get(name)
+    
+    def unload_sound(self, name:str) -> bool:
+        sound = self._sounds.pop(name, None)
+        if sound is None: return False
+        self._sound_memory -= sound.byte_size
+        if self._game and self._game._mixer: self._game._mixer.forget(sound)
+        return True
+    
+    def load_music(self, path:str, name:str=None, volume:float=1.0) -> 'Music':
+        """
+        Register a music track, nothing is read until it plays and then it is streamed from disk
+        """
+        from .io import convert_path, get_name_from_path
+        _path = convert_path(path)
+        _name = name if name else get_name_from_path(_path)
+        music = Music(_name, _path, volume)
+        music.id = uuid.uuid4()
+        self._music[_name] = music
+        return music
+    
+    def _decode_asset(self, path:str) -> 'pygame.Surface|pygame.mixer.Sound|str':
+        # Thread safe, runs on the hot reload worker. Streamed music has nothing to decode, its path is passed through
+        from .io import sound_extensions, music_extensions
+        key = self._path_key(path)
+        if any(self._path_key(music._path)==key for music in list(self._music.values()) if music._path): return path
+        ext = os.path.splitext(path)[1].lower()
+        if ext in sound_extensions or any(self._path_key(sound._path)==key for sound in list(self._sounds.values()) if sound._path):
+            if not pygame.mixer.get_init(): return None
+            return pygame.mixer.Sound(path)
+        if ext in music_extensions: return path
+        return self._decode(path)
+    
+    @staticmethod
+    def _path_key(path:str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+    
+    def _swap_asset(self, path:str, data:'pygame.Surface|pygame.mixer.Sound|str', load_new:bool=True) -> list['Asset']:
+        """
+        Put freshly decoded data into the assets loaded from path, existing references stay valid.
+        Returns the updated (or newly loaded) assets
+        """
+        if data is None: return []
+        key = self._path_key(path)
+        same = lambda asset: asset._path and self._path_key(asset._path)==key
+        name = os.path.splitext(os.path.basename(path))[0]
+        if isinstance(data, str):
+            # Music is read from disk as it plays, the track only has to be reopened (see Mixer.reload_music)
+            tracks = [music for music in self._music.values() if same(music)]
+            if tracks or not load_new: return tracks
+            return [self.load_music(path, name)]
+        if isinstance(data, pygame.mixer.Sound):
+            sounds = [sound for sound in self._sounds.values() if same(sound)]
+            for sound in sounds:
+                self._sound_memory -= sound.byte_size
+                sound._swap(data)
+                self._sound_memory += sound.byte_size
+            if sounds or not load_new: return sounds
+            return [self.load_sound(path, name)]
+        surface = data.convert_alpha()
+        textures = [texture for texture in self._textures.values() if same(texture)]
+        if not textures:
+            return [self._add_texture(name, path, surface)] if load_new else []
+        for texture in textures:
+            self._swap_texture(texture, surface)
+        return textures
+    
+    def _swap_texture(self, texture:'Texture', surface:pygame.Surface):
+        old = texture._surface
+        # Evicted textures reload from disk on next use and get the new file anyway
+        if old is None: return
+        if old.get_size()==surface.get_size():
+            # Same size: overwrite the pixels in place, so atlas pages, sprite sheet frames and any other view see the new art
+            old.fill((0, 0, 0, 0))
+            old.blit(surface, (0, 0), None, pygame.BLEND_RGBA_MAX)
+            return
+        # A new size can't fit the old pixels (or atlas slot), the texture gets its own surface and views are rebuilt
+        self._memory_used -= texture.byte_size
+        texture._surface = surface
+        texture._size = vec2(surface.get_width(), surface.get_height())
+        self._memory_used += texture.byte_size
+        for sheet in self._spritesheets.values():
+            if sheet._texture is texture: sheet._rebind()
+        # A former atlas region now owns its pixels and can be evicted like any standalone texture
+        if texture._refcount==0 and texture._id in self._textures_by_id and self._evictable(texture):
+            self._unreferenced[texture._id] = texture
+        self._evict(texture)
+    
+    def get_music(self, name:str) -> 'Music':
+        return self._music.get(name)
+    
+    def load_font(self, path:str=None, size:int=16, name:str=None, antialias:bool=True) -> 'Font':
+        """
+        Load a TTF/OTF font at a pixel size, pygame's default font when path is None
+        """
+        from .io import convert_path, get_name_from_path
+        if not pygame.font.get_init(): pygame.font.init()
+        _path = convert_path(path) if path else ""
+        _name = name if name else f"{get_name_from_path(_path) if path else 'default'}@{size}"
+        font = Font(_name, _path, pygame.font.Font(_path if path else None, size), antialias)
+        font.id = uuid.uuid4()
+        self._fonts[_name] = font
+        return font
+    
+    def get_font(self, name:str) -> 'Font':
+        return self._fonts.get(name)
+    
+    def load_resources_from_folder(self, path:str, atlas:bool=False, atlas_size:int=1024, types:int=AssetTypes.texture, font_size:int=16):
+        """
+        Load every image below path. With AssetTypes.sound in types .wav files are loaded as sounds,
+        with AssetTypes.music compressed audio is registered as streamed music and with AssetTypes.font
+        TTF/OTF fonts are loaded at font_size (named "name@size").
+        With atlas, small images are packed into shared pages and their textures are subsurfaces of those pages
+        """
+        if types & AssetTypes.sound:
+            from .io import sound_extensions
+            for file, name in self._find_resources(path, sound_extensions):
+                self.load_sound(file, name)
+        if types & AssetTypes.music:
+            from .io import music_extensions
+            for file, name in self._find_resources(path, music_extensions):
+                self.load_music(file, name)
+        if types & AssetTypes.font:
+            from .io import font_extensions
+            for file, name in self._find_resources(path, font_extensions):
+                self.load_font(file, font_size, f"{name}@{font_size}")
+        if not types & AssetTypes.texture: return None
+        files_to_load = self._find_resources(path)
+        if not atlas:
+            defer, self._defer_evict = self._defer_evict, True
+            try:
+                for file, name in files_to_load:
+                    self.load_texture(file, name)
+            finally:
+                self._defer_evict = defer
+                self._evict()
+            return None
+        builder = AtlasBuilder(atlas_size)
+        for file, name in files_to_load:
+            builder.add((file, name), self._decode(file).convert_alpha())
+        self.add_atlas(builder)
         return None
     
-    def load_resources_from_folder(self, path:str):
+    def load_resources_from_folder_async(self, path:str, workers:int=None, progress:Callable[[int, int, str], None]=None, atlas:bool=False, atlas_size:int=1024) -> 'LoadingJob':
+        """
+        Decode every image below path on a thread pool. Call poll() on the returned job
+        once per frame (or wait() / await wait_async()) to register the textures
+        """
+        from .loading import LoadingJob
+        return LoadingJob(self, self._find_resources(path), workers, progress, atlas, atlas_size)
+    
+    def _find_resources(self, path:str, extensions:list[str]=None) -> list[tuple[str, str]]:
         from .io import convert_path, image_extensions
+        if extensions is None: extensions = image_extensions
         _path = convert_path(path)
+        files_to_load:list[tuple[str, str]] = []
         for p, folders, files in os.walk(_path):
             for file in files:
                 name, ext = os.path.splitext(file)
-                if ext.lower() in image_extensions:
-                    self.load_texture(os.path.join(p, file), name)
-        return None
+                if ext.lower() in extensions:
+                    files_to_load.append((os.path.join(p, file), name))
+        return files_to_load
+    
+    def load_spritesheet(self, path:str, frame_size:vec2=None, rects:list[pygame.Rect]=None, name:str=None, count:int=None) -> 'SpriteSheet':
+        """
+        Load (or reuse) the texture at path and slice it into a grid of frame_size cells or explicit rects
+        """
+        from .io import convert_path, get_name_from_path
+        _name = name if name else os.path.basename(get_name_from_path(path))
+        texture = self._textures.get(_name)
+        if texture is None or texture.path!=convert_path(path):
+            texture = self.load_texture(path, _name)
+        sheet = SpriteSheet(texture, rects, _name) if rects is not None else SpriteSheet.from_grid(texture, frame_size, count, name=_name)
+        self._spritesheets[_name] = sheet
+        return sheet
+    
+    def get_spritesheet(self, name:str) -> 'SpriteSheet':
+        return self._spritesheets.get(name)
+    
+    def add_atlas(self, builder:AtlasBuilder) -> list[AtlasPage]:
+        """
+        Pack a builder whose keys are (path, name) pairs and register the resulting textures
+        """
+        surfaces, pages = builder.build()
+        defer, self._defer_evict = self._defer_evict, True
+        try:
+            for (file, name), surface in surfaces.items():
+                self._add_texture(name, file, surface)
+        finally:
+            self._defer_evict = defer
+            self._evict()
+        log("Packed {} textures into {} atlas pages", logLevel.trace, len(surfaces), len(pages))
+        return pages
 
 class Asset:
     def __init__(self, name:str=None, path:str=None) -> None:
@@ -225,6 +1177,9 @@ class Asset:
 class Texture(Asset):
     def __init__(self, name:str=None, path:str=None, surface:pygame.Surface=None, size:vec2=None) -> None:
         Asset.__init__(self, name, path)
+        self._manager:ResourceManager = None
+        self._refcount:int = 0
+        self._last_used:int = 0
         if surface:
             self._size = size if size else vec2(surface.get_width(), surface.get_height())
             self._surface = surface
@@ -232,6 +1187,32 @@ class Texture(Asset):
             self._size = size if size else vec2(0, 0)
             self._surface = pygame.Surface(self._size)
     
+    @property
+    def surface(self) -> pygame.Surface:
+        manager = self._manager
+        if manager:
+            # First use this frame moves the texture to the recent end of the eviction order
+            if self._last_used!=manager._frame:
+                self._last_used = manager._frame
+                if self._refcount==0 and self._id in manager._unreferenced: manager._unreferenced.move_to_end(self._id)
+            # Evicted by the resource manager, reload transparently
+            if self._surface is None: manager._reload_texture(self)
+        return self._surface
+
+    @property
+    def size(self) -> vec2: return self._size
+
+    @property
+    def byte_size(self) -> int:
+        return int(self._size.x)*int(self._size.y)*(self._surface.get_bytesize() if self._surface else 4)
+
+    @property
+    def atlas(self) -> pygame.Surface:
+        """
+        Atlas page this texture is a region of, None for standalone textures
+        """
+        return self.surface.get_parent()
+    
     def __str__(self) -> str:
         return f"Texture({self._name}, {self._size})"
     
@@ -249,19 +1230,266 @@ class Texture(Asset):
     
     def copy(self) -> 'Texture':
         # Perform a deep copy, even on pygame's side
-        return Texture(self._name, self._surface.copy(), self._size)
+        return Texture(self._name, self._path, self.surface.copy(), vec2(self._size))
+
+# Frames of a texture as zero-copy subsurface views, all sharing the texture's pixels
+class SpriteSheet(Asset):
+    def __init__(self, texture:Texture, rects:list[pygame.Rect], name:str=None) -> None:
+        Asset.__init__(self, name if name else texture.name, texture.path)
+        self._texture:Texture = texture
+        # Keeps the resource manager from evicting the pixels the frames point into
+        self._handle:TextureHandle = texture._manager.acquire(texture.name) if texture._manager else None
+        self._rects:list[pygame.Rect] = [pygame.Rect(rect) for rect in rects]
+        surface = texture.surface
+        self._frames:list[Texture] = [Texture(f"{self._name}[{i}]", self._path, surface.subsurface(rect)) for i, rect in enumerate(self._rects)]
+    
+    @staticmethod
+    def from_grid(texture:Texture, frame_size:vec2, count:int=None, margin:int=0, spacing:int=0, name:str=None) -> 'SpriteSheet':
+        """
+        Slice texture into frame_size cells, left to right then top to bottom
+        """
+        fw, fh = int(frame_size[0]), int(frame_size[1])
+        w, h = int(texture.size.x), int(texture.size.y)
+        rects:list[pygame.Rect] = []
+        for y in range(margin, h-fh+1, fh+spacing):
+            for x in range(margin, w-fw+1, fw+spacing):
+                rects.append(pygame.Rect(x, y, fw, fh))
+        if count is not None: rects = rects[:count]
+        return SpriteSheet(texture, rects, name)
+    
+    @property
+    def texture(self) -> Texture: return self._texture
+
+    @property
+    def frames(self) -> list[Texture]: return self._frames
+    
+    def _rebind(self):
+        # Point the frames at the texture's current surface, after a hot reload changed its size
+        surface = self._texture.surface
+        bounds = surface.get_rect()
+        for frame, rect in zip(self._frames, self._rects):
+            view = rect.clip(bounds)
+            frame._surface = surface.subsurface(view)
+            frame._size = vec2(view.w, view.h)
+    
+    def frame(self, index:int) -> Texture:
+        return self._frames[index]
+    
+    def __len__(self) -> int:
+        return len(self._frames)
+    
+    def __str__(self) -> str:
+        return f"SpriteSheet({self._name}, {len(self._frames)} frames)"
+    
+    def __repr__(self) -> str:
+        return self.__str__()
 
-# Event base class
+# Short effect decoded once into a shared buffer, played through the game's Mixer
+class Sound(Asset):
+    def __init__(self, name:str=None, path:str=None, sound:pygame.mixer.Sound=None, priority:int=0, max_voices:int=4, min_interval:float=0.0, volume:float=1.0) -> None:
+        Asset.__init__(self, name, path)
+        self._sound:pygame.mixer.Sound = sound
+        # Higher priority voices steal channels from lower ones, 0 max_voices means no cap
+        self.priority:int = priority
+        self.max_voices:int = max_voices
+        # Plays closer together than this are dropped, merges bursts of the same effect
+        self.min_interval:float = min_interval
+        self._volume:float = volume
+        self._byte_size:int = 0
+        if sound: self._swap(sound)
+    
+    @property
+    def sound(self) -> pygame.mixer.Sound: return self._sound
+    
+    @property
+    def volume(self) -> float: return self._volume
+    @volume.setter
+    def volume(self, value:float): self._volume = value
+    
+    @property
+    def length(self) -> float:
+        return self._sound.get_length() if self._sound else 0.0
+    
+    def _swap(self, sound:pygame.mixer.Sound):
+        # Voices already playing keep the old buffer until they end
+        self._sound = sound
+        init = pygame.mixer.get_init()
+        if init:
+            frequency, format, channels = init
+            self._byte_size = int(sound.get_length()*frequency)*channels*(abs(format)//8)
+    
+    @property
+    def byte_size(self) -> int: return self._byte_size
+    
+    def __str__(self) -> str:
+        return f"Sound({self._name}, {self.length:.2f}s)"
+    
+    def __repr__(self) -> str:
+        return self.__str__()
+
+# Music track, streamed from its path by pygame.mixer.music when played
+class Music(Asset):
+    def __init__(self, name:str=None, path:str=None, volume:float=1.0) -> None:
+        Asset.__init__(self, name, path)
+        self.volume:float = volume
+    
+    def __str__(self) -> str:
+        return f"Music({self._name})"
+    
+    def __repr__(self) -> str:
+        return self.__str__()
+
+# Font drawn as batched glyph blits from glyph atlases. Glyphs are rasterised in white and cached strings are tinted
+# once when composed, only uncached text needs an atlas per color and those are kept to the most recently used few
+class Font(Asset):
+    def __init__(self, name:str=None, path:str=None, font:pygame.font.Font=None, antialias:bool=True, cache_size:int=256, max_atlases:int=8) -> None:
+        Asset.__init__(self, name, path)
+        self._font:pygame.font.Font = font
+        self._antialias:bool = antialias
+        self._white:GlyphAtlas = GlyphAtlas(font, Colors.white, antialias)
+        self._atlases:OrderedDict[tuple, GlyphAtlas] = OrderedDict()
+        self._max_atlases:int = max_atlases
+        self._cache:TextCache = TextCache(cache_size)
+        self._line_size:int = font.get_linesize()
+    
+    @property
+    def font(self) -> pygame.font.Font: return self._font
+    
+    @property
+    def height(self) -> int: return self._font.get_height()
+    
+    @property
+    def line_size(self) -> int: return self._line_size
+    
+    @property
+    def cache(self) -> TextCache: return self._cache
+    
+    def atlas(self, color:Color) -> GlyphAtlas:
+        key = tuple(color.to_pygame)[:3]
+        if key==(255, 255, 255): return self._white
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            if len(self._atlases)>=self._max_atlases: self._atlases.popitem(last=False)
+            atlas = self._atlases[key] = GlyphAtlas(self._font, color, self._antialias)
+        else:
+            self._atlases.move_to_end(key)
+        return atlas
+    
+    def measure(self, text:str) -> tuple[int, int]:
+        atlas = self._white
+        lines = text.split("\n")
+        width = 0
+        for line in lines:
+            x = right = 0
+            for char in line:
+                surface, advance = atlas.glyph(char)
+                # The last glyph's ink can extend past its advance
+                right = max(right, x+surface.get_width())
+                x += advance
+            width = max(width, right, x)
+        return (width, self._line_size*(len(lines)-1)+self.height)
+    
+    def render(self, text:str, color:Color=Colors.white) -> pygame.Surface:
+        """
+        Surface of the whole string, composed once from the glyph atlas and kept in the static string cache
+        """
+        key = (text, tuple(color.to_pygame))
+        surface = self._cache.get(key)
+        if surface is not None: return surface
+        surface = pygame.Surface(self.measure(text), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        surface.blits([(glyph, position, None, pygame.BLEND_RGBA_MAX) for glyph, position in self._layout(text, Colors.white, (0, 0))], doreturn=False)
+        # White glyphs times the color, alpha untouched like a glyph rendered in that color
+        rgb = tuple(color.to_pygame)[:3]
+        if rgb!=(255, 255, 255): surface.fill((*rgb, 255), special_flags=pygame.BLEND_RGBA_MULT)
+        return self._cache.put(key, surface)
+    
+    def draw(self, batch:SpriteBatch, text:str, position:vec2, color:Color=Colors.white, layer:int=0, cache:bool=True) -> pygame.Rect:
+        """
+        Submit text at position. Cached strings cost one blit, uncached ones (counters changing every frame)
+        one blit per glyph, all from the same atlas page. Returns the covered rect
+        """
+        x, y = int(position[0]), int(position[1])
+        if cache:
+            surface = self.render(text, color)
+            batch.submit_surface(surface, (x, y), layer)
+            return pygame.Rect((x, y), surface.get_size())
+        for glyph, glyph_position in self._layout(text, color, (x, y)):
+            batch.submit_surface(glyph, glyph_position, layer)
+        return pygame.Rect((x, y), self.measure(text))
+    
+    def _layout(self, text:str, color:Color, origin:tuple[int, int]) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        atlas = self.atlas(color)
+        x, y = origin
+        glyphs:list[tuple[pygame.Surface, tuple[int, int]]] = []
+        for char in text:
+            if char=="\n":
+                x = origin[0]
+                y += self._line_size
+                continue
+            surface, advance = atlas.glyph(char)
+            glyphs.append((surface, (x, y)))
+            x += advance
+        return glyphs
+    
+    def __str__(self) -> str:
+        return f"Font({self._name}, {self.height}px)"
+    
+    def __repr__(self) -> str:
+        return self.__str__()
+
+# Reference to a texture held by game code, release it (or use it as a context manager) when done
+class TextureHandle:
+    def __init__(self, texture:Texture) -> None:
+        self._texture:Texture = texture
+    
+    @property
+    def texture(self) -> Texture: return self._texture
+
+    @property
+    def surface(self) -> pygame.Surface: return self._texture.surface
+    
+    def release(self):
+        if self._texture is None: return
+        texture, self._texture = self._texture, None
+        if texture._manager: texture._manager._release(texture)
+        else: texture._refcount -= 1
+    
+    def __enter__(self) -> Texture:
+        return self._texture
+    
+    def __exit__(self, *args):
+        self.release()
+    
+    def __del__(self):
+        self.release()
+
+# Event base class, events use __slots__ so firing them stays cheap
 class Event:
+    __slots__ = ("_consumed",)
+
     def __init__(self):
         self._consumed = False
+    
+    @property
+    def consumed(self) -> bool: return self._consumed
+    
+    def consume(self):
+        """
+        Stop propagation to the remaining listeners
+        """
+        self._consumed = True
 
 # Event triggered when the game is about to quit
 class EventQuit(Event):
+    __slots__ = ()
+
     def __init__(self):
         Event.__init__(self)
 
 class EventKey(Event):
+    __slots__ = ("_key",)
+
     def __init__(self, key:Key):
         Event.__init__(self)
         self._key:Key = key
@@ -270,18 +1498,46 @@ class EventKey(Event):
     def key(self)->Key: return self._key
 
 class EventKeydown(EventKey):
+    __slots__ = ()
+
     def __init__(self, key:Key):
         EventKey.__init__(self, key)
 
 class EventKeyup(EventKey):
+    __slots__ = ()
+
     def __init__(self, key:Key):
         EventKey.__init__(self, key)
 
 class EventWindowResize(Event):
+    __slots__ = ("size",)
+
     def __init__(self, size:vec2):
         Event.__init__(self)
         self.size:vec2 = size
 
+# Event triggered when hot reload swapped new content into an asset (or loaded a new file)
+class EventAssetReloaded(Event):
+    __slots__ = ("asset",)
+
+    def __init__(self, asset:Asset):
+        Event.__init__(self)
+        self.asset:Asset = asset
+
+# Recycles event objects of one class for high frequency events
+class EventPool:
+    def __init__(self, event_class:Event.__class__, size:int=0) -> None:
+        self._event_class:Event.__class__ = event_class
+        self._free:list[Event] = [event_class.__new__(event_class) for _ in range(size)]
+    
+    def acquire(self, *args, **kwargs) -> Event:
+        event = self._free.pop() if self._free else self._event_class.__new__(self._event_class)
+        event.__init__(*args, **kwargs)
+        return event
+    
+    def release(self, event:Event):
+        self._free.append(event)
+
 # Event listener base class
 class EventListener:
     def __init__(self, event_class:Event.__class__) -> None:
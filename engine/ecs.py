@@ -0,0 +1,173 @@
+from typing import Callable
+import numpy as np
+from .enums import *
+
+# Entity ids pack a generation in the high bits and a slot index in the low bits,
+# so an id of a destroyed entity never aliases the entity that reuses its slot
+_index_bits = 32
+_index_mask = (1<<_index_bits)-1
+
+def entity_index(entity:int) -> int:
+    return entity & _index_mask
+
+def entity_generation(entity:int) -> int:
+    return entity>>_index_bits
+
+# Entity-component store, each component is a contiguous NumPy column indexed by dense row.
+# Systems operate on whole columns, rows stay packed thanks to swap-remove
+class World:
+    def __init__(self, capacity:int=1024) -> None:
+        self._capacity:int = max(1, capacity)
+        self._count:int = 0
+        self._columns:dict[str, np.ndarray] = {}
+        self._defaults:dict[str, object] = {}
+        self._entities:np.ndarray = np.zeros(self._capacity, dtype=np.int64)     # row -> entity id
+        self._rows:np.ndarray = np.full(self._capacity, -1, dtype=np.int64)      # slot index -> row
+        self._generations:np.ndarray = np.zeros(self._capacity, dtype=np.int64)  # slot index -> generation
+        self._free:list[int] = []
+        self._next_index:int = 0
+        self._systems:list[Callable[['World', float], None]] = []
+
+    @property
+    def count(self) -> int: return self._count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def entities(self) -> np.ndarray:
+        """
+        Ids of the live entities, in row order
+        """
+        return self._entities[:self._count]
+
+    def define_component(self, name:str, dtype=np.float32, shape:tuple=(), default=0) -> 'World':
+        if name in self._columns: raise KeyError(f"Component {name} already defined")
+        self._columns[name] = np.full((self._capacity,)+tuple(shape), default, dtype=dtype)
+        self._defaults[name] = default
+        return self
+
+    def column(self, name:str) -> np.ndarray:
+        """
+        View of a component for every live entity, writes go straight to the store
+        """
+        return self._columns[name][:self._count]
+
+    def create(self, **components) -> int:
+        if self._free:
+            index = self._free.pop()
+        else:
+            index = self._next_index
+            self._next_index += 1
+        if self._count>=self._capacity or index>=len(self._rows):
+            self._grow(max(self._capacity*2, index+1))
+        row = self._count
+        self._count += 1
+        entity = int(self._generations[index])<<_index_bits | index
+        self._entities[row] = entity
+        self._rows[index] = row
+        for name, column in self._columns.items():
+            column[row] = components.get(name, self._defaults[name])
+        return entity
+
+    def create_many(self, count:int, **components) -> np.ndarray:
+        """
+        Create count entities at once, component values may be scalars or arrays of length count
+        """
+        reused = [self._free.pop() for _ in range(min(count, len(self._free)))]
+        fresh = count-len(reused)
+        indices = np.concatenate((np.array(reused, dtype=np.int64), np.arange(self._next_index, self._next_index+fresh, dtype=np.int64)))
+        self._next_index += fresh
+        start = self._count
+        if start+count>self._capacity or self._next_index>len(self._rows):
+            self._grow(max(self._capacity*2, start+count, self._next_index))
+        rows = np.arange(start, start+count, dtype=np.int64)
+        ids = (self._generations[indices]<<_index_bits) | indices
+        self._entities[rows] = ids
+        self._rows[indices] = rows
+        self._count += count
+        for name, column in self._columns.items():
+            column[start:start+count] = components.get(name, self._defaults[name])
+        return ids
+
+    def destroy(self, entity:int) -> bool:
+        if not self.alive(entity): return False
+        index = entity & _index_mask
+        row = int(self._rows[index])
+        last = self._count-1
+        if row!=last:
+            # Move the last row into the hole so columns stay packed
+            for column in self._columns.values():
+                column[row] = column[last]
+            moved = int(self._entities[last])
+            self._entities[row] = moved
+            self._rows[moved & _index_mask] = row
+        self._count = last
+        self._rows[index] = -1
+        self._generations[index] += 1
+        self._free.append(index)
+        return True
+
+    def alive(self, entity:int) -> bool:
+        index = entity & _index_mask
+        return index<self._next_index and self._rows[index]>=0 and int(self._generations[index])==entity>>_index_bits
+
+    def row(self, entity:int) -> int:
+        if not self.alive(entity): raise KeyError(f"Entity {entity} is not alive")
+        return int(self._rows[entity & _index_mask])
+
+    def get(self, entity:int, name:str):
+        return self._columns[name][self.row(entity)]
+
+    def set(self, entity:int, name:str, value) -> 'World':
+        self._columns[name][self.row(entity)] = value
+        return self
+
+    def add_system(self, system:Callable[['World', float], None]) -> 'World':
+        self._systems.append(system)
+        return self
+
+    def update(self, dt:float):
+        for system in self._systems:
+            system(self, dt)
+
+    def _grow(self, capacity:int):
+        for name, column in self._columns.items():
+            grown = np.full((capacity,)+column.shape[1:], self._defaults[name], dtype=column.dtype)
+            grown[:self._capacity] = column
+            self._columns[name] = grown
+        entities = np.zeros(capacity, dtype=np.int64)
+        entities[:self._capacity] = self._entities
+        self._entities = entities
+        rows = np.full(capacity, -1, dtype=np.int64)
+        rows[:len(self._rows)] = self._rows
+        self._rows = rows
+        generations = np.zeros(capacity, dtype=np.int64)
+        generations[:len(self._generations)] = self._generations
+        self._generations = generations
+        self._capacity = capacity
+
+# =================================================
+# ==================== Systems ====================
+# =================================================
+def movement_system(position:str="position", velocity:str="velocity") -> Callable[[World, float], None]:
+    """
+    position += velocity*dt over every entity, both components are (2,) float columns
+    """
+    def system(world:World, dt:float):
+        pos = world.column(position)
+        pos += world.column(velocity)*dt
+    return system
+
+def draw_sprites(world:World, batch:'SpriteBatch', textures:list['Texture'], position:str="position", sprite:str="sprite", layer:int=0) -> int:
+    """
+    Submit every entity's sprite to batch, one submit_many per sprite id. Returns the number of sprites
+    """
+    count = world.count
+    if not count: return 0
+    ids = world.column(sprite)
+    positions = world.column(position).astype(np.int32)
+    for sprite_id in np.unique(ids):
+        if not 0<=sprite_id<len(textures): continue
+        batch.submit_many(textures[sprite_id], positions[ids==sprite_id].tolist(), layer)
+    return count
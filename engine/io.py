@@ -1,9 +1,20 @@
 import os
 import sys
+import json
+import time
+import queue
+import atexit
+import threading
+from typing import Callable
 from .enums import *
 import uuid
 
 image_extensions = [".png", ".jpg", ".jpeg", ".gif", ".bmp"]
+# Folder loading decodes uncompressed files as sound effects and streams compressed ones as music,
+# load_sound and load_music themselves accept any format
+sound_extensions = [".wav"]
+music_extensions = [".ogg", ".mp3", ".flac", ".mod", ".xm", ".it", ".s3m"]
+font_extensions = [".ttf", ".otf"]
 
 class AssetTypes:
     texture = 1<<0
@@ -39,12 +50,198 @@ def color_ansi(text, color:Color):
 def background(text, rgb:Color):
     return "\033[48;2;{};{};{}m{}\033[0m".format(str(int(rgb.r)), str(int(rgb.g)), str(int(rgb.b)), text)
 
-def log(msg, type:Color=logLevel.info) -> None:
-    pretext = "[WARN]" if type==logLevel.warning else "[INFO]" if type==logLevel.info or type==logLevel.trace else "[TIME]" if type==logLevel.timer else "[ERRO]"
-    print(color("{} {}".format(pretext, format(msg)), type))
+# =================================================
+# ==================== Logging ====================
+# =================================================
+# Severity of each log level, messages below the logger threshold are dropped before formatting
+_severity:dict[Color, int] = {
+    logLevel.trace: 0,
+    logLevel.info: 1,
+    logLevel.timer: 1,
+    logLevel.warning: 2,
+    logLevel.error: 3,
+}
+
+def _pretext(type:Color) -> str:
+    return "[WARN]" if type==logLevel.warning else "[INFO]" if type==logLevel.info or type==logLevel.trace else "[TIME]" if type==logLevel.timer else "[ERRO]"
+
+def _level_name(type:Color) -> str:
+    return "warning" if type==logLevel.warning else "info" if type==logLevel.info else "trace" if type==logLevel.trace else "timer" if type==logLevel.timer else "error"
+
+# Log sinks receive already formatted records on the writer thread
+class LogSink:
+    def write(self, timestamp:float, type:Color, msg:str):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+class ConsoleSink(LogSink):
+    def __init__(self, stream=None) -> None:
+        self._stream = stream
+
+    def write(self, timestamp:float, type:Color, msg:str):
+        stream = self._stream if self._stream else sys.stdout
+        if type is None: stream.write("\n")
+        else: stream.write(color("{} {}".format(_pretext(type), msg), type)+"\n")
+
+    def flush(self):
+        (self._stream if self._stream else sys.stdout).flush()
+
+class FileSink(LogSink):
+    def __init__(self, path:str) -> None:
+        self._file = open(path, "a", encoding="utf-8", buffering=1<<16)
+
+    def write(self, timestamp:float, type:Color, msg:str):
+        if type is None: return
+        self._file.write("{} {} {}\n".format(time.strftime("%H:%M:%S", time.localtime(timestamp)), _pretext(type), msg))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+# Structured sink, one JSON object per line
+class JsonLinesSink(FileSink):
+    def write(self, timestamp:float, type:Color, msg:str):
+        if type is None: return
+        self._file.write(json.dumps({"time": timestamp, "level": _level_name(type), "msg": msg})+"\n")
+
+class Logger:
+    def __init__(self, level:Color=logLevel.info, sinks:list[LogSink]=None, asynchronous:bool=True) -> None:
+        self._threshold:int = _severity.get(level, 1)
+        self._sinks:list[LogSink] = sinks if sinks is not None else [ConsoleSink()]
+        self._queue:queue.SimpleQueue = None
+        self._thread:threading.Thread = None
+        self._lock:threading.Lock = threading.Lock()
+        if asynchronous: self._start()
+
+    def _start(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="logger", daemon=True)
+        self._thread.start()
+
+    def _after_fork(self):
+        # Threads don't survive fork: the child (a process pool worker) gets a fresh queue and writer.
+        # Records still queued in the parent belong to the parent and are dropped here
+        self._lock = threading.Lock()
+        if self._queue is not None: self._start()
+
+    @property
+    def level(self) -> int: return self._threshold
+
+    def set_level(self, level:Color) -> 'Logger':
+        self._threshold = _severity.get(level, 1)
+        return self
+
+    def enabled(self, type:Color) -> bool:
+        return _severity.get(type, 1)>=self._threshold
+
+    def add_sink(self, sink:LogSink) -> 'Logger':
+        with self._lock:
+            self._sinks = self._sinks+[sink]
+        return self
+
+    def log(self, msg, type:Color=logLevel.info, *args):
+        if _severity.get(type, 1)<self._threshold: return
+        # Arguments are formatted on the caller so later mutations don't leak into the record
+        if callable(msg): msg = msg()
+        msg = format(msg).format(*args) if args else format(msg)
+        self._emit((time.time(), type, msg))
+
+    def newline(self):
+        self._emit((time.time(), None, ""))
+
+    def flush(self):
+        """
+        Block until every record logged so far has been written
+        """
+        if self._queue is None or not self._thread.is_alive():
+            self._write([])
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        self.flush()
+        if self._queue is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        for sink in self._sinks:
+            try:
+                sink.close()
+            except (OSError, ValueError):
+                pass
+
+    def _emit(self, record:tuple):
+        if self._queue is not None: self._queue.put(record)
+        else: self._write([record])
+
+    def _write(self, records:list[tuple]):
+        # A failing sink (closed pipe, full disk) must not kill the writer thread and block flush
+        for sink in self._sinks:
+            try:
+                for record in records: sink.write(*record)
+                sink.flush()
+            except (OSError, ValueError):
+                pass
+
+    def _run(self):
+        # Drain in bulk so a burst of records costs one flush per sink
+        while True:
+            record = self._queue.get()
+            records:list[tuple] = []
+            waiters:list[threading.Event] = []
+            while True:
+                if record is None:
+                    self._write(records)
+                    for waiter in waiters: waiter.set()
+                    return
+                if isinstance(record, threading.Event): waiters.append(record)
+                else: records.append(record)
+                if len(records)>=256: break
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(records)
+            for waiter in waiters: waiter.set()
+
+_logger:Logger = Logger()
+atexit.register(lambda: _logger.close())
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: _logger._after_fork())
+
+def get_logger() -> Logger:
+    return _logger
+
+def set_logger(logger:Logger) -> Logger:
+    global _logger
+    previous, _logger = _logger, logger
+    previous.close()
+    return logger
+
+def set_log_level(level:Color):
+    _logger.set_level(level)
+
+def log_enabled(type:Color) -> bool:
+    return _severity.get(type, 1)>=_logger._threshold
+
+def log(msg, type:Color=logLevel.info, *args) -> None:
+    """
+    Log msg at level type. msg may be a format string for args or a callable returning the message,
+    neither is evaluated when the level is filtered out
+    """
+    if _severity.get(type, 1)<_logger._threshold: return
+    _logger.log(msg, type, *args)
 
 def log_newline() -> None:
-    print("")
+    _logger.newline()
 
 def logf(frame: int, target_frame: int, *args, **kwargs) -> None:
     """
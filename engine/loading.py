@@ -0,0 +1,94 @@
+import queue
+from typing import Callable
+from .enums import *
+from .io import log
+from .atlas import AtlasBuilder
+
+# Decodes images on a thread pool, display dependent conversion happens on the main thread in poll
+class LoadingJob:
+    def __init__(self, rm:'ResourceManager', files:list[tuple[str, str]], workers:int=None, progress:Callable[[int, int, str], None]=None, atlas:bool=False, atlas_size:int=1024) -> None:
+        self._rm:'ResourceManager' = rm
+        self._total:int = len(files)
+        self._loaded:int = 0
+        self._progress:Callable[[int, int, str], None] = progress
+        self._builder:AtlasBuilder = AtlasBuilder(atlas_size) if atlas else None
+        self._finished:bool = False
+        # Files that failed to decode, they still count as processed so the job can finish
+        self._errors:list[tuple[str, Exception]] = []
+        self._done_queue:queue.SimpleQueue = queue.SimpleQueue()
+        # Imported here, concurrent.futures and asyncio add noticeably to the engine's import time
+        from concurrent.futures import ThreadPoolExecutor
+        self._executor:'ThreadPoolExecutor' = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-decode")
+        for file, name in files:
+            # pygame releases the GIL while SDL_image decodes, so this scales over threads
+            future = self._executor.submit(rm._decode, file)
+            future.add_done_callback(lambda f, file=file, name=name: self._done_queue.put((file, name, f)))
+        self._executor.shutdown(wait=False)
+        if not files: self._finish()
+
+    @property
+    def total(self) -> int: return self._total
+
+    @property
+    def loaded(self) -> int: return self._loaded
+
+    @property
+    def progress(self) -> float:
+        return self._loaded/self._total if self._total else 1.0
+
+    @property
+    def done(self) -> bool: return self._finished
+
+    @property
+    def errors(self) -> list[tuple[str, Exception]]:
+        """
+        (file, error) of every image that couldn't be loaded
+        """
+        return self._errors
+
+    def poll(self, max_items:int=None) -> float:
+        """
+        Register the images decoded so far without blocking, returns the progress in [0, 1]
+        """
+        count = 0
+        while not self._finished and (max_items is None or count<max_items):
+            try:
+                item = self._done_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._register(*item)
+            count += 1
+        return self.progress
+
+    def wait(self) -> 'LoadingJob':
+        """
+        Block until every image is registered
+        """
+        while not self._finished:
+            self._register(*self._done_queue.get())
+        return self
+
+    async def wait_async(self, max_items_per_step:int=8) -> 'LoadingJob':
+        import asyncio
+        while not self._finished:
+            self.poll(max_items_per_step)
+            await asyncio.sleep(0)
+        return self
+
+    def _register(self, file:str, name:str, future:'Future'):
+        try:
+            surface = future.result().convert_alpha()
+        except Exception as e:
+            # A broken file must not stall the job, it is reported in errors once skipped
+            log("Could not load {}: {}", logLevel.error, file, e)
+            self._errors.append((file, e))
+        else:
+            if self._builder: self._builder.add((file, name), surface)
+            else: self._rm._add_texture(name, file, surface)
+        self._loaded += 1
+        if self._progress: self._progress(self._loaded, self._total, name)
+        if self._loaded==self._total: self._finish()
+
+    def _finish(self):
+        if self._builder: self._rm.add_atlas(self._builder)
+        self._finished = True
@@ -0,0 +1,86 @@
+from typing import Callable
+
+# Drives a game with a fixed rate simulation and a variable rate render.
+# update(dt) always gets the same dt, render(alpha) gets how far the simulation is into the next step
+class GameLoop:
+    def __init__(self, game:'Game', update:Callable[[float], None], render:Callable[[float], None]=None, tick_rate:float=120, max_frame_time:float=0.25, max_steps:int=8) -> None:
+        self._game:'Game' = game
+        self._update:Callable[[float], None] = update
+        self._render:Callable[[float], None] = render
+        self._step:float = 1/tick_rate
+        # Spiral of death guards: a long frame is clamped, and a frame never runs more than max_steps updates
+        self._max_frame_time:float = max_frame_time
+        self._max_steps:int = max_steps
+        self._accumulator:float = 0.0
+        self._alpha:float = 0.0
+        self._steps:int = 0
+        self._dropped:float = 0.0
+
+    @property
+    def step(self) -> float: return self._step
+
+    @property
+    def tick_rate(self) -> float: return 1/self._step
+    @tick_rate.setter
+    def tick_rate(self, value:float): self._step = 1/value
+
+    @property
+    def alpha(self) -> float: return self._alpha
+
+    @property
+    def steps(self) -> int:
+        """
+        Number of fixed updates run since the loop started
+        """
+        return self._steps
+
+    @property
+    def dropped_time(self) -> float:
+        """
+        Simulation time discarded by the spiral of death guards
+        """
+        return self._dropped
+
+    def advance(self, frame_time:float) -> int:
+        """
+        Run the fixed updates owed for frame_time seconds, returns how many ran
+        """
+        if frame_time>self._max_frame_time:
+            self._dropped += frame_time-self._max_frame_time
+            frame_time = self._max_frame_time
+        self._accumulator += frame_time
+        step = self._step
+        count = 0
+        profile = self._game.profile
+        with profile("update"):
+            while self._accumulator>=step and count<self._max_steps:
+                self._update(step)
+                self._accumulator -= step
+                count += 1
+        if self._accumulator>=step:
+            # Still behind after max_steps, give up on the backlog instead of trying to catch up forever
+            self._dropped += self._accumulator-self._accumulator%step
+            self._accumulator %= step
+        self._steps += count
+        self._alpha = self._accumulator/step
+        return count
+
+    def frame(self, frame_time:float=None):
+        """
+        One rendered frame: events, fixed updates, render, present.
+        frame_time overrides the measured frame duration, for simulations running faster than real time
+        """
+        game = self._game
+        game.begin_frame()
+        if not game.should_run():
+            game.end_frame()
+            return
+        # game.dt is the duration of the previous frame, or the recorded one when replaying
+        self.advance(game.dt if frame_time is None else frame_time)
+        if self._render: self._render(self._alpha)
+        game.draw_frame()
+        game.end_frame()
+
+    def run(self, frame_time:float=None):
+        while self._game.should_run():
+            self.frame(frame_time)
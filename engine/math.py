@@ -5,3 +5,7 @@ class Math:
     @staticmethod
     def randin(min:int, max:int) -> int:
         return random.randint(min, max)
+
+    @staticmethod
+    def lerp(a:float, b:float, t:float) -> float:
+        return a+(b-a)*t
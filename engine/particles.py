@@ -0,0 +1,132 @@
+import numpy as np
+from .enums import *
+
+class blendMode:
+    """
+    Particle blend modes
+    """
+    alpha       = 0
+    additive    = 1
+
+# Particle state lives in NumPy arrays, alive particles are kept packed at the front
+class ParticleSystem:
+    def __init__(self, capacity:int=10000, blend:int=blendMode.additive, gravity:vec2=vec2(0, 0), drag:float=0.0, seed:int=None) -> None:
+        self._capacity:int = capacity
+        self._count:int = 0
+        self._blend:int = blend
+        self._gravity:np.ndarray = np.array((gravity[0], gravity[1]), dtype=np.float32)
+        self._drag:float = drag
+        self._rng:np.random.Generator = np.random.default_rng(seed)
+        self._position:np.ndarray = np.zeros((capacity, 2), dtype=np.float32)
+        self._velocity:np.ndarray = np.zeros((capacity, 2), dtype=np.float32)
+        self._life:np.ndarray = np.zeros(capacity, dtype=np.float32)
+        self._max_life:np.ndarray = np.ones(capacity, dtype=np.float32)
+        self._color:np.ndarray = np.zeros((capacity, 3), dtype=np.float32)
+
+    @property
+    def count(self) -> int: return self._count
+
+    @property
+    def capacity(self) -> int: return self._capacity
+
+    @property
+    def blend(self) -> int: return self._blend
+    @blend.setter
+    def blend(self, value:int): self._blend = value
+
+    def emit(self, count:int, position:vec2, speed:tuple[float, float]=(10, 30), direction:float=0.0, spread:float=np.pi*2, life:tuple[float, float]=(0.5, 1.0), color:Color=Colors.orange, color_jitter:int=0) -> int:
+        """
+        Spawn up to count particles at position, moving at a random speed within spread radians around direction.
+        Returns how many were spawned, the rest are dropped when the system is full
+        """
+        count = min(count, self._capacity-self._count)
+        if count<=0: return 0
+        s = slice(self._count, self._count+count)
+        rng = self._rng
+        angle = direction+(rng.random(count, dtype=np.float32)-0.5)*spread
+        velocity = rng.uniform(speed[0], speed[1], count).astype(np.float32)
+        self._position[s] = (position[0], position[1])
+        self._velocity[s, 0] = np.cos(angle)*velocity
+        self._velocity[s, 1] = np.sin(angle)*velocity
+        self._max_life[s] = rng.uniform(life[0], life[1], count)
+        self._life[s] = self._max_life[s]
+        self._color[s] = (color.r, color.g, color.b)
+        if color_jitter:
+            self._color[s] += rng.uniform(-color_jitter, color_jitter, (count, 3))
+            # Jitter can push channels out of range, a negative one would wrap around when drawn additively
+            np.clip(self._color[s], 0, 255, out=self._color[s])
+        self._count += count
+        return count
+
+    def update(self, dt:float):
+        n = self._count
+        if not n: return
+        pos, vel, life = self._position[:n], self._velocity[:n], self._life[:n]
+        if self._drag: vel *= max(0.0, 1.0-self._drag*dt)
+        vel += self._gravity*dt
+        pos += vel*dt
+        life -= dt
+        alive = life>0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count==n: return
+        # Compact the survivors to the front
+        for array in (self._position, self._velocity, self._life, self._max_life, self._color):
+            array[:alive_count] = array[:n][alive]
+        self._count = alive_count
+
+    def clear(self):
+        self._count = 0
+
+    def draw(self, surface:pygame.Surface, offset:vec2=vec2(0, 0)) -> pygame.Rect:
+        """
+        Write the particles straight into surface's pixels, returns the touched rect (None if nothing was drawn)
+        """
+        n = self._count
+        if not n: return None
+        w, h = surface.get_size()
+        x = np.floor(self._position[:n, 0]+offset[0]).astype(np.int32)
+        y = np.floor(self._position[:n, 1]+offset[1]).astype(np.int32)
+        inside = (x>=0) & (x<w) & (y>=0) & (y<h)
+        if not inside.any(): return None
+        x, y = x[inside], y[inside]
+        fade = (self._life[:n]/self._max_life[:n])[inside]
+        color = self._color[:n][inside]
+        pixels = pygame.surfarray.pixels3d(surface)
+        try:
+            if self._blend==blendMode.additive:
+                # bincount sums overlapping particles, one pass per channel
+                flat = x*h+y
+                cells = np.unique(flat)
+                tx, ty = cells//h, cells%h
+                for channel in range(3):
+                    added = np.bincount(flat, weights=color[:, channel]*fade, minlength=w*h)[cells]
+                    pixels[tx, ty, channel] = np.minimum(pixels[tx, ty, channel]+added, 255).astype(np.uint8)
+            else:
+                alpha = fade[:, None]
+                current = pixels[x, y].astype(np.float32)
+                pixels[x, y] = np.clip(current+(color-current)*alpha, 0, 255).astype(np.uint8)
+        finally:
+            # Release the surface lock before anything blits it
+            del pixels
+        return pygame.Rect(int(x.min()), int(y.min()), int(x.max()-x.min())+1, int(y.max()-y.min())+1)
+
+# Spawns particles into a system at a steady rate
+class Emitter:
+    def __init__(self, system:ParticleSystem, position:vec2, rate:float, **emit_args) -> None:
+        self._system:ParticleSystem = system
+        self.position:vec2 = vec2(position)
+        self.rate:float = rate
+        self.active:bool = True
+        self._emit_args:dict = emit_args
+        self._accumulator:float = 0.0
+
+    def update(self, dt:float) -> int:
+        if not self.active: return 0
+        self._accumulator += self.rate*dt
+        count = int(self._accumulator)
+        if not count: return 0
+        self._accumulator -= count
+        return self._system.emit(count, self.position, **self._emit_args)
+
+    def burst(self, count:int) -> int:
+        return self._system.emit(count, self.position, **self._emit_args)
@@ -0,0 +1,158 @@
+import json
+import time
+import threading
+from collections import deque
+from .enums import *
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self): return self
+
+    def __exit__(self, *args): return False
+
+_null_scope = _NullScope()
+_overlay_colors = (Colors.green.to_pygame, Colors.yellow.to_pygame, Colors.red.to_pygame)
+
+class _Scope:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler:'Profiler', name:str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self._profiler._record(self._name, self._start, time.perf_counter())
+        return False
+
+# Timing of one frame, total duration and the summed duration of each named scope
+class FrameSample:
+    __slots__ = ("start", "duration", "scopes")
+
+    def __init__(self, start:float) -> None:
+        self.start:float = start
+        self.duration:float = 0.0
+        self.scopes:dict[str, float] = {}
+
+# Named scoped timers with a rolling per-frame history and Chrome trace export
+class Profiler:
+    def __init__(self, max_frames:int=100, enabled:bool=True, max_trace_events:int=100000) -> None:
+        self._enabled:bool = enabled
+        self._history:deque[FrameSample] = deque(maxlen=max_frames)
+        self._current:FrameSample = None
+        self._trace:deque[tuple[str, float, float, int]] = deque(maxlen=max_trace_events)
+        self._origin:float = time.perf_counter()
+
+    @property
+    def enabled(self) -> bool: return self._enabled
+    @enabled.setter
+    def enabled(self, value:bool): self._enabled = value
+
+    @property
+    def history(self) -> deque[FrameSample]: return self._history
+
+    def scope(self, name:str):
+        """
+        Context manager timing the enclosed block, free when the profiler is disabled
+        """
+        if not self._enabled: return _null_scope
+        return _Scope(self, name)
+
+    def begin_frame(self):
+        if not self._enabled: return
+        self._current = FrameSample(time.perf_counter())
+
+    def end_frame(self):
+        if not self._enabled or self._current is None: return
+        end = time.perf_counter()
+        self._current.duration = end-self._current.start
+        self._trace.append(("frame", self._current.start, end, 0))
+        self._history.append(self._current)
+        self._current = None
+
+    def average(self, name:str=None) -> float:
+        """
+        Mean duration of a scope over the history, or of whole frames without a name
+        """
+        if not self._history: return 0.0
+        if name is None: return sum(sample.duration for sample in self._history)/len(self._history)
+        return sum(sample.scopes.get(name, 0.0) for sample in self._history)/len(self._history)
+
+    def clear(self):
+        self._history.clear()
+        self._trace.clear()
+
+    def _record(self, name:str, start:float, end:float):
+        if self._current is not None:
+            scopes = self._current.scopes
+            scopes[name] = scopes.get(name, 0.0)+end-start
+        self._trace.append((name, start, end, threading.get_ident()))
+
+    def export_chrome_trace(self, path:str):
+        """
+        Write the recorded scopes as Chrome trace-event JSON (chrome://tracing, Perfetto)
+        """
+        main = threading.main_thread().ident
+        events = [{
+            "name": name,
+            "ph": "X",
+            "ts": (start-self._origin)*1e6,
+            "dur": (end-start)*1e6,
+            "pid": 0,
+            "tid": 0 if tid in (0, main) else tid,
+        } for name, start, end, tid in self._trace]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def draw_overlay(self, surface:pygame.Surface, rect:pygame.Rect, budget:float=1/60):
+        """
+        Bar graph of the last frame times, one column per frame, scaled so budget is half the height
+        """
+        if not self._history: return
+        surface.fill((0, 0, 0), rect)
+        frames = list(self._history)[-rect.w:]
+        x = rect.right-len(frames)
+        for sample in frames:
+            ratio = sample.duration/budget
+            h = min(rect.h, max(1, int(ratio*rect.h/2)))
+            col = _overlay_colors[0 if ratio<=1 else 1 if ratio<=2 else 2]
+            surface.fill(col, (x, rect.bottom-h, 1, h))
+            x += 1
+
+# Durations of the steps between engine import and the first presented frame
+class StartupReport:
+    def __init__(self) -> None:
+        self._phases:dict[str, float] = {}
+        self._last:float = time.perf_counter()
+
+    @property
+    def phases(self) -> dict[str, float]: return self._phases
+
+    @property
+    def total(self) -> float: return sum(self._phases.values())
+
+    def add(self, name:str, duration:float) -> 'StartupReport':
+        self._phases[name] = self._phases.get(name, 0.0)+duration
+        return self
+
+    def restart(self) -> 'StartupReport':
+        self._last = time.perf_counter()
+        return self
+
+    def mark(self, name:str) -> 'StartupReport':
+        """
+        Close a phase running since the previous mark (or restart)
+        """
+        now = time.perf_counter()
+        self.add(name, now-self._last)
+        self._last = now
+        return self
+
+    def __str__(self) -> str:
+        phases = ", ".join(f"{name} {duration*1000:.1f}ms" for name, duration in self._phases.items())
+        return f"Startup {self.total*1000:.1f}ms: {phases}"
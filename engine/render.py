@@ -0,0 +1,177 @@
+from .enums import *
+
+class drawFlags:
+    """
+    Sprite draw flags
+    """
+    none        = 0
+    flip_x      = 1<<0
+    flip_y      = 1<<1
+    additive    = 1<<2
+    multiply    = 1<<3
+
+_flip_mask = drawFlags.flip_x | drawFlags.flip_y
+
+def _blend_mode(flags:int) -> int:
+    if flags & drawFlags.additive: return pygame.BLEND_RGBA_ADD
+    if flags & drawFlags.multiply: return pygame.BLEND_RGBA_MULT
+    return 0
+
+# Collects draw submissions during a frame and sends them to a surface in one blits call per layer and texture.
+# Submissions are bucketed by source surface as they arrive, so nothing has to be sorted at flush time
+class SpriteBatch:
+    def __init__(self, sort_by_texture:bool=True, max_flipped:int=256) -> None:
+        # layer -> source surface (None when not grouping) -> blits items
+        self._layers:dict[int, dict[pygame.Surface, list[tuple]]] = {}
+        self._sort_by_texture:bool = sort_by_texture
+        self._flipped:dict[tuple[pygame.Surface, int], pygame.Surface] = {}
+        self._max_flipped:int = max_flipped
+        # What the last flush_changes left on its target, in draw order: blits items, their rects and comparison keys
+        self._drawn:list[tuple] = []
+        self._drawn_rects:list[tuple[int, int, int, int]] = []
+        self._drawn_keys:list[tuple] = []
+
+    def __len__(self) -> int:
+        return sum(len(items) for buckets in self._layers.values() for items in buckets.values())
+
+    def submit(self, texture:'Texture', position:vec2, layer:int=0, flags:int=drawFlags.none) -> 'SpriteBatch':
+        # Texture.surface is only needed for evicted textures or the first use in a frame, which stamps the LRU
+        surface = texture._surface
+        manager = texture._manager
+        if manager is not None and (surface is None or texture._last_used!=manager._frame): surface = texture.surface
+        if flags:
+            if flags & _flip_mask:
+                surface = self._get_flipped(surface, flags & _flip_mask)
+            item = (surface, position, None, _blend_mode(flags))
+        else:
+            item = (surface, position)
+        buckets = self._layers.get(layer)
+        if buckets is None:
+            buckets = self._layers[layer] = {}
+        key = surface if self._sort_by_texture else None
+        items = buckets.get(key)
+        if items is None:
+            buckets[key] = [item]
+        else:
+            items.append(item)
+        return self
+
+    def submit_many(self, texture:'Texture', positions:list[vec2], layer:int=0, flags:int=drawFlags.none) -> 'SpriteBatch':
+        """
+        Submit the same texture at several positions, cheaper than one submit per sprite
+        """
+        surface = texture.surface
+        if flags & _flip_mask:
+            surface = self._get_flipped(surface, flags & _flip_mask)
+        blend = _blend_mode(flags)
+        items = self._bucket(layer, surface)
+        if blend: items.extend([(surface, position, None, blend) for position in positions])
+        else: items.extend([(surface, position) for position in positions])
+        return self
+
+    def submit_surface(self, surface:pygame.Surface, position:vec2, layer:int=0, flags:int=drawFlags.none, area:pygame.Rect=None) -> 'SpriteBatch':
+        if flags & _flip_mask:
+            surface = self._get_flipped(surface, flags & _flip_mask)
+        self._bucket(layer, surface).append((surface, position, area, _blend_mode(flags)))
+        return self
+
+    def flush(self, target:pygame.Surface, dirty:list[pygame.Rect]=None) -> int:
+        """
+        Draw every submission onto target, lowest layer first, and empty the queue.
+        The touched rects are appended to dirty when given
+        """
+        count = 0
+        for layer in sorted(self._layers):
+            buckets = self._layers[layer]
+            for items in buckets.values():
+                count += len(items)
+                if dirty is None:
+                    target.blits(items, doreturn=False)
+                else:
+                    dirty.extend(target.blits(items))
+            buckets.clear()
+        return count
+
+    def flush_changes(self, target:pygame.Surface, background:pygame.Color, full:bool=False) -> list[pygame.Rect]:
+        """
+        Draw onto a target that still holds the previous flush_changes, only repainting the regions where a submission
+        was added, removed or changed since then. Returns those regions, or None when the whole target was repainted
+        """
+        items:list[tuple] = []
+        for layer in sorted(self._layers):
+            buckets = self._layers[layer]
+            for bucket in buckets.values():
+                items.extend(bucket)
+            buckets.clear()
+        # Positions are snapshotted into the rects, a vec2 moved after submitting must not compare equal to itself
+        rects:list[tuple[int, int, int, int]] = []
+        keys:list[tuple] = []
+        for item in items:
+            surface, position = item[0], item[1]
+            area = item[2] if len(item)>2 else None
+            w, h = (area[2], area[3]) if area else surface.get_size()
+            rect = (int(position[0]), int(position[1]), w, h)
+            rects.append(rect)
+            keys.append((surface, rect, tuple(area) if area else None, item[3] if len(item)>3 else 0))
+        previous = self._drawn_keys
+        self._drawn, self._drawn_rects, self._drawn_keys = items, rects, keys
+        if full: return self._repaint_all(target, background)
+        if keys==previous: return []
+        current_set, previous_set = set(keys), set(previous)
+        # Submissions present in both frames must still be drawn in the same order, overlaps would change otherwise
+        if [key for key in keys if key in previous_set]!=[key for key in previous if key in current_set]:
+            return self._repaint_all(target, background)
+        regions = [pygame.Rect(key[1]) for key in current_set.symmetric_difference(previous_set)]
+        area = sum(rect.w*rect.h for rect in regions)
+        if area*2>target.get_width()*target.get_height(): return self._repaint_all(target, background)
+        self.repaint(target, background, regions)
+        return regions
+
+    def repaint(self, target:pygame.Surface, background:pygame.Color, regions:list[pygame.Rect]) -> 'SpriteBatch':
+        """
+        Restore regions of the target to what the last flush_changes drew there, erasing anything drawn over it since
+        """
+        rects = self._drawn_rects
+        clip = target.get_clip()
+        for region in regions:
+            target.set_clip(region)
+            target.fill(background, region)
+            hits = region.collidelistall(rects)
+            # Indices come back ascending, which is draw order
+            if hits: target.blits([self._drawn[i] for i in hits], doreturn=False)
+        target.set_clip(clip)
+        return self
+
+    def _repaint_all(self, target:pygame.Surface, background:pygame.Color) -> list[pygame.Rect]:
+        target.fill(background)
+        target.blits(self._drawn, doreturn=False)
+        return None
+
+    def clear(self) -> 'SpriteBatch':
+        for buckets in self._layers.values():
+            buckets.clear()
+        return self
+
+    def clear_cache(self) -> 'SpriteBatch':
+        self._flipped.clear()
+        return self
+
+    def _bucket(self, layer:int, surface:pygame.Surface) -> list[tuple]:
+        buckets = self._layers.get(layer)
+        if buckets is None:
+            buckets = self._layers[layer] = {}
+        key = surface if self._sort_by_texture else None
+        items = buckets.get(key)
+        if items is None:
+            items = buckets[key] = []
+        return items
+
+    def _get_flipped(self, surface:pygame.Surface, flip:int) -> pygame.Surface:
+        key = (surface, flip)
+        flipped = self._flipped.get(key)
+        if flipped is None:
+            # Dropped wholesale when full, like the camera's scaled copies
+            if len(self._flipped)>=self._max_flipped: self._flipped.clear()
+            flipped = pygame.transform.flip(surface, bool(flip & drawFlags.flip_x), bool(flip & drawFlags.flip_y))
+            self._flipped[key] = flipped
+        return flipped
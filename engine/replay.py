@@ -0,0 +1,96 @@
+import struct
+from .enums import *
+
+# Binary input log: a header, then per frame the frame delta, an event count and the events
+_magic = b"PXR1"
+_frame = struct.Struct("<fH")
+_event = struct.Struct("<Bii")
+
+class recordedEvent:
+    """
+    Event types stored in input logs
+    """
+    quit    = 0
+    keydown = 1
+    keyup   = 2
+    resize  = 3
+
+def _encode(event:pygame.event.Event) -> tuple[int, int, int]:
+    if event.type==pygame.QUIT: return (recordedEvent.quit, 0, 0)
+    if event.type==pygame.KEYDOWN: return (recordedEvent.keydown, event.key, 0)
+    if event.type==pygame.KEYUP: return (recordedEvent.keyup, event.key, 0)
+    if event.type==pygame.VIDEORESIZE: return (recordedEvent.resize, event.w, event.h)
+    return None
+
+def _decode(kind:int, a:int, b:int) -> pygame.event.Event:
+    if kind==recordedEvent.quit: return pygame.event.Event(pygame.QUIT)
+    if kind==recordedEvent.keydown: return pygame.event.Event(pygame.KEYDOWN, key=a)
+    if kind==recordedEvent.keyup: return pygame.event.Event(pygame.KEYUP, key=a)
+    if kind==recordedEvent.resize: return pygame.event.Event(pygame.VIDEORESIZE, w=a, h=b, size=(a, b))
+    raise ValueError(f"Unknown recorded event type {kind}")
+
+# Writes the input stream of every frame to a log
+class InputRecorder:
+    def __init__(self, path:str) -> None:
+        self._path:str = path
+        self._file = open(path, "wb")
+        self._file.write(_magic)
+        self._pending:list[tuple[int, int, int]] = []
+        self._frames:int = 0
+
+    @property
+    def frames(self) -> int: return self._frames
+
+    def record_events(self, events:list[pygame.event.Event]):
+        for event in events:
+            encoded = _encode(event)
+            if encoded: self._pending.append(encoded)
+
+    def end_frame(self, dt:float):
+        self._file.write(_frame.pack(dt, len(self._pending)))
+        for encoded in self._pending:
+            self._file.write(_event.pack(*encoded))
+        self._pending.clear()
+        self._frames += 1
+
+    def close(self):
+        if self._file.closed: return
+        self._file.close()
+
+# Reads an input log back, one frame at a time
+class InputReplay:
+    def __init__(self, path:str, quit_on_end:bool=True) -> None:
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:len(_magic)]!=_magic:
+            raise ValueError(f"{path} is not an input log")
+        self._frames:list[tuple[float, list[pygame.event.Event]]] = []
+        offset = len(_magic)
+        while offset<len(data):
+            dt, count = _frame.unpack_from(data, offset)
+            offset += _frame.size
+            events = [_decode(*_event.unpack_from(data, offset+i*_event.size)) for i in range(count)]
+            offset += count*_event.size
+            self._frames.append((dt, events))
+        self._quit_on_end:bool = quit_on_end
+        self._index:int = 0
+
+    @property
+    def frames(self) -> int: return len(self._frames)
+
+    @property
+    def done(self) -> bool: return self._index>=len(self._frames)
+
+    def next_events(self) -> list[pygame.event.Event]:
+        if self.done:
+            return [pygame.event.Event(pygame.QUIT)] if self._quit_on_end else []
+        return self._frames[self._index][1]
+
+    def end_frame(self) -> float:
+        """
+        Recorded delta of the current frame, in seconds
+        """
+        if self.done: return 0.0
+        dt = self._frames[self._index][0]
+        self._index += 1
+        return dt
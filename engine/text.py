@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from .enums import *
+from .atlas import AtlasPage
+
+# Glyphs of one font in one color, rasterised on first use into shared atlas pages
+class GlyphAtlas:
+    def __init__(self, font:pygame.font.Font, color:Color, antialias:bool=True, page_size:int=256, padding:int=1) -> None:
+        self._font:pygame.font.Font = font
+        self._color:pygame.Color = color.to_pygame
+        self._antialias:bool = antialias
+        self._page_size:int = page_size
+        self._padding:int = padding
+        self._pages:list[AtlasPage] = []
+        # char -> (glyph view into a page, advance)
+        self._glyphs:dict[str, tuple[pygame.Surface, int]] = {}
+
+    @property
+    def page_count(self) -> int: return len(self._pages)
+
+    def glyph(self, char:str) -> tuple[pygame.Surface, int]:
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            glyph = self._glyphs[char] = self._rasterise(char)
+        return glyph
+
+    def _rasterise(self, char:str) -> tuple[pygame.Surface, int]:
+        surface = self._font.render(char, self._antialias, self._color)
+        metrics = self._font.metrics(char)
+        advance = metrics[0][4] if metrics and metrics[0] else surface.get_width()
+        w, h = surface.get_size()
+        # Pages reserve padding after every glyph, a glyph plus its padding must fit a page
+        if w==0 or w+self._padding>self._page_size or h+self._padding>self._page_size: return (surface, advance)
+        for page in self._pages:
+            view = page.add(char, surface)
+            if view is not None: return (view, advance)
+        # Pages are allocated up front since glyphs arrive one at a time
+        page = AtlasPage(self._page_size, self._page_size, self._padding).allocate()
+        view = page.add(char, surface)
+        if view is None: return (surface, advance)
+        self._pages.append(page)
+        return (view, advance)
+
+# Pre-composed surfaces of strings drawn unchanged frame after frame, least recently used dropped first
+class TextCache:
+    def __init__(self, max_entries:int=256) -> None:
+        self._entries:OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._max_entries:int = max_entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key:tuple) -> pygame.Surface:
+        surface = self._entries.get(key)
+        if surface is not None: self._entries.move_to_end(key)
+        return surface
+
+    def put(self, key:tuple, surface:pygame.Surface) -> pygame.Surface:
+        self._entries[key] = surface
+        if len(self._entries)>self._max_entries: self._entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,143 @@
+from array import array
+from .enums import *
+
+# Grid of tile indices into a tileset, drawn through pre-rendered chunk surfaces
+class TileMap:
+    empty = -1
+
+    def __init__(self, width:int, height:int, tile_size:int=16, tileset:list['Texture']=None, chunk_size:int=16) -> None:
+        self._width:int = width
+        self._height:int = height
+        self._tile_size:int = tile_size
+        self._chunk_size:int = chunk_size
+        self._tileset:list['Texture'] = list(tileset) if tileset else []
+        self._tiles:array = array('h', [TileMap.empty])*(width*height)
+        self._chunks_x:int = (width+chunk_size-1)//chunk_size
+        self._chunks_y:int = (height+chunk_size-1)//chunk_size
+        # None marks a chunk without any tile, missing keys are chunks still to render
+        self._chunks:dict[tuple[int, int], pygame.Surface] = {}
+        self._dirty:set[tuple[int, int]] = set()
+
+    @property
+    def width(self) -> int: return self._width
+
+    @property
+    def height(self) -> int: return self._height
+
+    @property
+    def tile_size(self) -> int: return self._tile_size
+
+    @property
+    def chunk_span(self) -> int:
+        """
+        Size of a chunk in pixels
+        """
+        return self._chunk_size*self._tile_size
+
+    @property
+    def pixel_size(self) -> vec2: return vec2(self._width*self._tile_size, self._height*self._tile_size)
+
+    @property
+    def tileset(self) -> list['Texture']: return self._tileset
+
+    def add_tile(self, texture:'Texture') -> int:
+        """
+        Append a texture to the tileset, returns its tile index
+        """
+        self._tileset.append(texture)
+        return len(self._tileset)-1
+
+    def set_tileset(self, tileset:list['Texture']) -> 'TileMap':
+        self._tileset = list(tileset)
+        self.invalidate()
+        return self
+
+    def get_tile(self, x:int, y:int) -> int:
+        if not (0<=x<self._width and 0<=y<self._height): return TileMap.empty
+        return self._tiles[y*self._width+x]
+
+    def set_tile(self, x:int, y:int, index:int) -> 'TileMap':
+        if not (0<=x<self._width and 0<=y<self._height): return self
+        i = y*self._width+x
+        if self._tiles[i]!=index:
+            self._tiles[i] = index
+            self._dirty.add((x//self._chunk_size, y//self._chunk_size))
+        return self
+
+    def fill(self, x:int, y:int, w:int, h:int, index:int) -> 'TileMap':
+        for ty in range(max(0, y), min(self._height, y+h)):
+            for tx in range(max(0, x), min(self._width, x+w)):
+                self.set_tile(tx, ty, index)
+        return self
+
+    def invalidate(self) -> 'TileMap':
+        """
+        Re-render every chunk on next draw, needed after tile textures change
+        """
+        self._chunks.clear()
+        self._dirty.clear()
+        return self
+
+    def asset_reloaded(self, asset:object) -> bool:
+        """
+        Invalidate the chunks if asset is one of the tile textures, or the file they were cut from.
+        Returns whether the map was affected
+        """
+        path = getattr(asset, "path", None)
+        for texture in self._tileset:
+            if texture is asset or (path and texture.path==path):
+                self.invalidate()
+                return True
+        return False
+
+    def visible_chunks(self, view:pygame.Rect) -> list[tuple[int, int]]:
+        """
+        Chunks overlapping view, given in map pixel coordinates
+        """
+        span = self._chunk_size*self._tile_size
+        x0, y0 = max(0, view.left//span), max(0, view.top//span)
+        x1, y1 = min(self._chunks_x, (view.right+span-1)//span), min(self._chunks_y, (view.bottom+span-1)//span)
+        return [(cx, cy) for cy in range(y0, y1) for cx in range(x0, x1)]
+
+    def get_chunk(self, cx:int, cy:int) -> pygame.Surface:
+        key = (cx, cy)
+        if key in self._dirty:
+            self._dirty.discard(key)
+            self._chunks.pop(key, None)
+        if key not in self._chunks:
+            self._chunks[key] = self._render_chunk(cx, cy)
+        return self._chunks[key]
+
+    def draw(self, batch:'SpriteBatch', position:vec2, view:pygame.Rect, layer:int=0) -> int:
+        """
+        Submit the chunks visible in view (target pixel coordinates) with the map origin at position.
+        Returns the number of chunks submitted
+        """
+        ox, oy = int(position[0]), int(position[1])
+        span = self._chunk_size*self._tile_size
+        count = 0
+        for cx, cy in self.visible_chunks(view.move(-ox, -oy)):
+            surface = self.get_chunk(cx, cy)
+            if surface is None: continue
+            batch.submit_surface(surface, (ox+cx*span, oy+cy*span), layer)
+            count += 1
+        return count
+
+    def _render_chunk(self, cx:int, cy:int) -> pygame.Surface:
+        cs, ts = self._chunk_size, self._tile_size
+        x0, y0 = cx*cs, cy*cs
+        x1, y1 = min(self._width, x0+cs), min(self._height, y0+cs)
+        tiles, tileset, width = self._tiles, self._tileset, self._width
+        blits:list[tuple[pygame.Surface, tuple[int, int]]] = []
+        for y in range(y0, y1):
+            row = y*width
+            for x in range(x0, x1):
+                index = tiles[row+x]
+                if 0<=index<len(tileset):
+                    blits.append((tileset[index].surface, ((x-x0)*ts, (y-y0)*ts)))
+        if not blits: return None
+        surface = pygame.Surface(((x1-x0)*ts, (y1-y0)*ts), pygame.SRCALPHA)
+        if pygame.display.get_surface(): surface = surface.convert_alpha()
+        surface.fill((0, 0, 0, 0))
+        surface.blits(blits, doreturn=False)
+        return surface
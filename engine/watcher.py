@@ -0,0 +1,194 @@
+import os
+import sys
+import time
+import queue
+import ctypes
+import ctypes.util
+import struct
+from typing import Callable
+from .enums import *
+from .io import log, image_extensions, sound_extensions, music_extensions
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO    = 0x00000080
+_IN_CREATE      = 0x00000100
+_IN_Q_OVERFLOW  = 0x00004000
+_IN_IGNORED     = 0x00008000
+_IN_ISDIR       = 0x40000000
+_event_header = struct.Struct("iIII")
+
+# Linux inotify through ctypes, the kernel reports changed files so nothing is scanned
+class _InotifyBackend:
+    def __init__(self, roots:list[str]) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd:int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd<0: raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs:dict[int, str] = {}
+        for root in roots:
+            for path, folders, files in os.walk(root):
+                self._add(path)
+
+    def _add(self, path:str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE)
+        if wd<0: raise OSError(ctypes.get_errno(), f"inotify_add_watch failed on {path}")
+        self._dirs[wd] = path
+
+    def changes(self) -> set[str]:
+        changed:set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset<len(data):
+                wd, mask, cookie, length = _event_header.unpack_from(data, offset)
+                offset += _event_header.size
+                name = os.fsdecode(data[offset:offset+length].rstrip(b"\0"))
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    log("File watcher queue overflowed, some changes were missed", logLevel.warning)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or mask & _IN_IGNORED: continue
+                path = os.path.join(directory, name)
+                if mask & _IN_ISDIR:
+                    # New folder: watch it and report what was already copied into it
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        for sub, folders, files in os.walk(path):
+                            self._add(sub)
+                            changed.update(os.path.join(sub, file) for file in files)
+                elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                    # IN_CREATE alone is skipped, the file is reported once its writer closes it
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        if self._fd>=0:
+            os.close(self._fd)
+            self._fd = -1
+
+# Portable fallback, compares (mtime, size) snapshots of the tree every interval
+class _PollingBackend:
+    def __init__(self, roots:list[str], interval:float) -> None:
+        self._roots:list[str] = roots
+        self._interval:float = interval
+        self._next_scan:float = 0.0
+        self._snapshot:dict[str, tuple[int, int]] = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot:dict[str, tuple[int, int]] = {}
+        stack = list(self._roots)
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self) -> set[str]:
+        now = time.monotonic()
+        if now<self._next_scan: return set()
+        self._next_scan = now+self._interval
+        snapshot = self._scan()
+        changed = {path for path, stamp in snapshot.items() if self._snapshot.get(path)!=stamp}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        self._snapshot.clear()
+
+# Reports the files created or modified below some folders since the last poll
+class FileWatcher:
+    def __init__(self, paths:list[str], extensions:list[str]=None, interval:float=0.5, use_inotify:bool=True) -> None:
+        self._roots:list[str] = [os.path.abspath(path) for path in ([paths] if isinstance(paths, str) else paths)]
+        self._extensions:set[str] = {ext.lower() for ext in extensions} if extensions else None
+        self._backend = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._backend = _InotifyBackend(self._roots)
+            except (OSError, AttributeError) as e:
+                log("inotify unavailable ({}), polling for file changes", logLevel.trace, e)
+        if self._backend is None:
+            self._backend = _PollingBackend(self._roots, interval)
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if isinstance(self._backend, _InotifyBackend) else "polling"
+
+    def poll(self) -> list[str]:
+        """
+        Changed files since the last call, each listed once
+        """
+        # Editors saving through a temporary file leave events for files that are already gone
+        changed = self._backend.changes()
+        if self._extensions is not None:
+            changed = {path for path in changed if os.path.splitext(path)[1].lower() in self._extensions}
+        return sorted(path for path in changed if os.path.isfile(path))
+
+    def close(self):
+        self._backend.close()
+
+# Watches asset folders, decodes changed files on a worker thread and swaps them into the loaded assets on the main thread
+class HotReloader:
+    def __init__(self, rm:'ResourceManager', paths:list[str], interval:float=0.5, load_new:bool=True, on_reload:Callable[[object], None]=None, use_inotify:bool=True) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+        self._rm:'ResourceManager' = rm
+        self._watcher:FileWatcher = FileWatcher(paths, image_extensions+sound_extensions+music_extensions, interval, use_inotify)
+        self._load_new:bool = load_new
+        self._on_reload:Callable[[object], None] = on_reload
+        # A single worker keeps results in submission order, a file saved twice lands with its latest content
+        self._executor:'ThreadPoolExecutor' = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset-reload")
+        self._done_queue:queue.SimpleQueue = queue.SimpleQueue()
+        self._reloaded:int = 0
+
+    @property
+    def watcher(self) -> FileWatcher: return self._watcher
+
+    @property
+    def reloaded(self) -> int:
+        """
+        Number of assets swapped since the reloader started
+        """
+        return self._reloaded
+
+    def poll(self) -> int:
+        """
+        Queue decodes for the files changed since the last call and apply the finished ones, returns how many assets were swapped
+        """
+        for path in self._watcher.poll():
+            future = self._executor.submit(self._rm._decode_asset, path)
+            future.add_done_callback(lambda f, path=path: self._done_queue.put((path, f)))
+        count = 0
+        while True:
+            try:
+                path, future = self._done_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                data = future.result()
+            except Exception as e:
+                # Usually a file caught mid-save, the next write triggers another attempt
+                if not os.path.exists(path): continue
+                log("Could not reload {}: {}", logLevel.warning, path, e)
+                continue
+            for asset in self._rm._swap_asset(path, data, self._load_new):
+                count += 1
+                if self._on_reload: self._on_reload(asset)
+        self._reloaded += count
+        return count
+
+    def close(self):
+        self._watcher.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
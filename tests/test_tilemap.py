@@ -0,0 +1,29 @@
+import time
+from engine.core import *
+
+def _save_tile(path:str, color:tuple[int, int, int]):
+    surface = pygame.Surface((8, 8))
+    surface.fill(color)
+    pygame.image.save(surface, path)
+
+def test_tileset_hot_reload_rerenders_chunks(tmp_path):
+    path = str(tmp_path/"tile.png")
+    _save_tile(path, (255, 0, 0))
+    game = Game("Test", headless=True, target_fps=0, audio=False).init()
+    try:
+        tilemap = TileMap(4, 4, 8, [game.rm.load_texture(path, "tile")]).fill(0, 0, 4, 4, 0)
+        game.draw_tilemap(tilemap)
+        assert tuple(tilemap.get_chunk(0, 0).get_at((0, 0)))[:3]==(255, 0, 0)
+
+        reloader = game.enable_hot_reload(str(tmp_path), interval=0)
+        _save_tile(path, (0, 0, 255))
+        deadline = time.monotonic()+5
+        while not reloader.reloaded and time.monotonic()<deadline:
+            reloader.poll()
+            time.sleep(0.01)
+        assert reloader.reloaded
+
+        game.draw_tilemap(tilemap)
+        assert tuple(tilemap.get_chunk(0, 0).get_at((0, 0)))[:3]==(0, 0, 255)
+    finally:
+        game.close()